@@ -3,10 +3,57 @@
 """ A set of tools for working with Google Earth Engine Python API in Jupyter
 notebooks """
 
+import sys
+from importlib import import_module
 from ._version import __version__
-from .map import Map
-from .assets import AssetManager
-from .tasks import TaskManager
-from . import chart, preview
-from .eprint import eprint, set_eprint_async, getInfo
-from .preview import set_preview_async
+
+# eprint is imported directly: the submodule has the same name, so a lazy
+# function would be shadowed by the module if the submodule was imported
+# first (`import ipygee.eprint`)
+from .eprint import eprint, eprint_async, set_eprint_async, getInfo
+
+# public attributes as name: (module, attribute). The module is imported the
+# first time one of its attributes is accessed, so importing ipygee does not
+# pay for ipyleaflet, pygal or pandas. If attribute is None the module itself
+# is the public attribute
+LAZY = {
+    'Map': ('.map', 'Map'),
+    'AssetManager': ('.assets', 'AssetManager'),
+    'TaskManager': ('.tasks', 'TaskManager'),
+    'chart': ('.chart', None),
+    'preview': ('.preview', None),
+    'set_preview_async': ('.preview', 'set_preview_async'),
+    'enable_disk_cache': ('.cache', 'enable_disk_cache'),
+    'disable_disk_cache': ('.cache', 'disable_disk_cache'),
+}
+
+__all__ = ['__version__', 'eprint', 'eprint_async', 'set_eprint_async',
+           'getInfo'] + list(LAZY.keys())
+
+
+def _load(name):
+    """ Import the module of a lazy attribute and set all the attributes of
+    that module in the package namespace """
+    module_name, _ = LAZY[name]
+    import_module(module_name, __name__)
+    for attr_name, (mod_name, attr) in LAZY.items():
+        if mod_name == module_name:
+            module = sys.modules[__name__ + mod_name]
+            value = getattr(module, attr) if attr else module
+            globals()[attr_name] = value
+    return globals()[name]
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name in LAZY:
+            return _load(name)
+        raise AttributeError("module '{}' has no attribute '{}'".format(
+            __name__, name))
+
+    def __dir__():
+        return sorted(set(globals()) | set(LAZY))
+else:
+    # module level __getattr__ is not supported (PEP 562)
+    for _name in LAZY:
+        _load(_name)
@@ -4,11 +4,16 @@
 
 from ipywidgets import *
 import ee
-from .threading import Thread
+from .threading import Worker
 from geetools import batch
 from .widgets import *
 from . import utils
 from . import dispatcher
+from .cache import LRUCache, cached, make_hash
+
+# lists of assets by folder. They are not kept on disk and expire soon, so
+# new exports show up without reloading
+LIST_CACHE = LRUCache(maxsize=256, ttl=60)
 
 
 class AssetManager(VBox):
@@ -79,18 +84,42 @@ class AssetManager(VBox):
         # Output widget
         output = HTML('')
 
-        def handle_yes(button):
-            self.children = [self.header, output]
-            # pool = pp.ProcessPool(self.POOL_SIZE)
-            if selected:
-                assets = [ass for ass in selected.keys()]
-                for assetid in assets:
-                    thread = Thread(target=batch.utils.recrusiveDeleteAsset,
-                                    args=(assetid,))
-                    thread.start()
-
-            # when deleting end, reload
+        def delete(assets, token):
+            errors = []
+            for i, assetid in enumerate(assets):
+                token.check()
+                output.value = 'Deleting {} ({}/{})...'.format(
+                    assetid, i+1, len(assets))
+                # an asset that cannot be deleted does not stop the others
+                try:
+                    batch.utils.recrusiveDeleteAsset(assetid)
+                except Exception as e:
+                    errors.append('{}: {}'.format(assetid, e))
+            return errors
+
+        def finish(errors):
+            # reload even if some assets could not be deleted and show why
             self.reload()
+            if errors:
+                output.value = 'Could not delete {} assets:</br>{}'.format(
+                    len(errors), '</br>'.join(errors))
+                self.children = [self.header, output] + \
+                    list(self.children[1:])
+
+        def handle_cancel_delete(button):
+            # the asset being deleted will be deleted, the rest will not
+            worker.cancel()
+            self.reload()
+
+        cancel_delete = Button(description='Cancel')
+        cancel_delete.on_click(handle_cancel_delete)
+        worker = Worker(target=delete, args=(list(selected.keys()),),
+                        callback=finish)
+
+        def handle_yes(button):
+            self.children = [self.header, output, cancel_delete]
+            # when deleting ends, reload (see `finish`)
+            worker.start()
 
         def handle_no(button):
             self.reload()
@@ -108,7 +137,8 @@ class AssetManager(VBox):
         self.children = [self.header, confirm, output]
 
     def reload(self, button=None):
-        new_accordion = self.core(self.root_path)
+        # request the lists of assets again, they may have changed
+        new_accordion = self.core(self.root_path, refresh=True)
         # Set VBox children
         self.children = [self.header, new_accordion]
 
@@ -148,10 +178,14 @@ class AssetManager(VBox):
         begin = self.children[2]  # CheckAccordion of root
         return wrap(begin)
 
-    def core(self, path):
+    def core(self, path, refresh=False):
+        """ Create a CheckAccordion with the assets inside `path`. The list
+        of assets is kept in LIST_CACHE for a minute. If `refresh` is True it
+        is requested again for this folder and the folders opened from it """
         # Get Assets data
-
-        root_list = ee.data.getList({'id': path})
+        root_list = cached(make_hash('getList', path),
+                           lambda: ee.data.getList({'id': path}),
+                           LIST_CACHE, refresh=refresh)
 
         # empty lists to fill with ids, types, widgets and paths
         ids = []
@@ -185,7 +219,7 @@ class AssetManager(VBox):
             index = change['index']
             ty = change['type']
             if ty == 'Folder' or ty == 'ImageCollection':
-                wid = self.core(path)
+                wid = self.core(path, refresh)
             else:
                 if ty == 'Image':
                     obj = ee.Image(path)
@@ -193,7 +227,7 @@ class AssetManager(VBox):
                     obj = ee.FeatureCollection(path)
 
                 try:
-                    wid = dispatcher.dispatch(obj).widget
+                    wid = dispatcher.dispatch(obj, refresh).widget
                 except Exception as e:
                     message = str(e)
                     wid = HTML(message)
@@ -0,0 +1,301 @@
+# coding=utf-8
+
+""" Caches to avoid repeating requests to Earth Engine. LRUCache keeps the
+results in memory, DiskCache keeps them across kernel restarts (enable it
+with `enable_disk_cache`) """
+
+from collections import OrderedDict
+from time import time
+import threading
+import hashlib
+import sqlite3
+import json
+import zlib
+import os
+
+_MISSING = object()
+
+
+def make_hash(*parts):
+    """ Make a hex digest out of the parsed parts. Dicts and lists are
+    dumped as sorted JSON so the same parameters always give the same hash
+
+    :param parts: strings, numbers, lists or dicts to hash
+    :return: a hex digest
+    :rtype: str
+    """
+    hasher = hashlib.sha1()
+    for part in parts:
+        if not isinstance(part, str):
+            part = json.dumps(part, sort_keys=True, default=str)
+        hasher.update(part.encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def is_asset_load(obj):
+    """ Check if an object is an Image loaded from an asset ID
+    (`ee.Image('ID')`). Only the information of these objects is persisted
+    (see `cached`): computed expressions (`collection.first()`) or images
+    made from computed IDs can change without changing their serialization
+
+    :param obj: the object to check
+    :type obj: ee.ComputedObject
+    :rtype: bool
+    """
+    try:
+        name = obj.func.getSignature()['name']
+    except AttributeError:
+        return False
+    args = obj.args or {}
+    return name == 'Image.load' and isinstance(args.get('id'), str) and \
+        all(isinstance(args[arg], int) for arg in args if arg != 'id')
+
+
+class LRUCache(object):
+    """ A thread safe Least Recently Used cache with an optional time to
+    live for each entry
+
+    :param maxsize: maximum number of entries. When it is reached the least
+        recently used entry is dropped
+    :type maxsize: int
+    :param ttl: time to live of each entry in seconds. If None entries never
+        expire
+    :type ttl: float
+    """
+    def __init__(self, maxsize=128, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def _expired(self, stored):
+        return self.ttl is not None and (time() - stored) > self.ttl
+
+    def get(self, key, default=None):
+        """ Get the value stored for `key` or `default` if it is not present
+        or has expired """
+        with self._lock:
+            if key not in self._data:
+                return default
+            value, stored = self._data[key]
+            if self._expired(stored):
+                self._data.pop(key)
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """ Store a value for `key` """
+        with self._lock:
+            self._data[key] = (value, time())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        """ Remove the entry for `key` if present """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_if(self, condition):
+        """ Remove all entries which key makes `condition(key)` True """
+        with self._lock:
+            for key in [k for k in self._data if condition(k)]:
+                self._data.pop(key)
+
+    def clear(self):
+        """ Remove all entries """
+        with self._lock:
+            self._data.clear()
+
+
+class DiskCache(object):
+    """ A persistent cache stored in a SQLite database. Values are stored as
+    compressed JSON, so only JSON serializable values can be stored
+
+    :param path: path of the database file. Defaults to
+        ~/.cache/ipygee/cache.sqlite
+    :type path: str
+    :param ttl: time to live of each entry in seconds. If None entries never
+        expire
+    :type ttl: float
+    :param maxbytes: maximum size of the stored (compressed) values. When it
+        is reached the least recently used entries are dropped
+    :type maxbytes: int
+    """
+    def __init__(self, path=None, ttl=7*24*3600, maxbytes=100*1024*1024):
+        if path is None:
+            path = os.path.join(os.path.expanduser('~'), '.cache', 'ipygee',
+                                'cache.sqlite')
+        dirname = os.path.dirname(path)
+        if dirname and not os.path.exists(dirname):
+            os.makedirs(dirname)
+        self.path = path
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, '
+                'value BLOB, size INTEGER, stored REAL, used REAL)')
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COUNT(*) FROM cache').fetchone()[0]
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key, default=None):
+        """ Get the value stored for `key` or `default` if it is not present
+        or has expired """
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                'SELECT value, stored FROM cache WHERE key = ?',
+                (key,)).fetchone()
+            if row is None:
+                return default
+            value, stored = row
+            if self.ttl is not None and (time() - stored) > self.ttl:
+                self._conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                return default
+            self._conn.execute('UPDATE cache SET used = ? WHERE key = ?',
+                               (time(), key))
+        return json.loads(zlib.decompress(value).decode('utf-8'))
+
+    def set(self, key, value):
+        """ Store a value for `key`. Values that cannot be dumped to JSON
+        are not stored """
+        try:
+            blob = zlib.compress(json.dumps(value).encode('utf-8'))
+        except (TypeError, ValueError):
+            return
+        now = time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)',
+                (key, sqlite3.Binary(blob), len(blob), now, now))
+            self._evict()
+
+    def _evict(self):
+        total = self._conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM cache').fetchone()[0]
+        if total <= self.maxbytes:
+            return
+        rows = self._conn.execute(
+            'SELECT key, size FROM cache ORDER BY used').fetchall()
+        for key, size in rows:
+            if total <= self.maxbytes:
+                break
+            self._conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+            total -= size
+
+    def invalidate(self, key):
+        """ Remove the entry for `key` if present """
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+
+    def clear(self):
+        """ Remove all entries """
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM cache')
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# persistent cache shared by all modules. None if it is not enabled
+DISK_CACHE = None
+
+
+def enable_disk_cache(path=None, ttl=7*24*3600, maxbytes=100*1024*1024):
+    """ Keep the metadata requested to Earth Engine (band names and types of
+    images and the values requested with `persist=True`, see `cached`) on
+    disk, so it is not requested again after restarting the kernel. See
+    DiskCache for the parameters
+
+    :return: the disk cache
+    :rtype: DiskCache
+    """
+    global DISK_CACHE
+    disable_disk_cache()
+    DISK_CACHE = DiskCache(path, ttl, maxbytes)
+    return DISK_CACHE
+
+
+def disable_disk_cache():
+    """ Stop using the disk cache. The file is kept """
+    global DISK_CACHE
+    if DISK_CACHE is not None:
+        DISK_CACHE.close()
+        DISK_CACHE = None
+
+
+def cached(key, compute, memory=None, refresh=False, persist=False):
+    """ Get a value from the memory cache, then from the disk cache (if
+    enabled and `persist` is True). If it is not present compute it and
+    store it in both
+
+    :param key: the key of the value (see `make_hash`)
+    :type key: str
+    :param compute: a function that takes no arguments and returns the value
+    :type compute: function
+    :param memory: the memory cache
+    :type memory: LRUCache
+    :param refresh: compute the value even if it is cached
+    :type refresh: bool
+    :param persist: use the disk cache. Only for values that do not change
+        while they are cached, like the metadata of the images of the
+        catalog (see `is_asset_load`). Lists of assets or computed results
+        must not be persisted
+    :type persist: bool
+    """
+    disk = DISK_CACHE if persist else None
+    if not refresh:
+        if memory is not None:
+            value = memory.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+        if disk is not None:
+            value = disk.get(key, _MISSING)
+            if value is not _MISSING:
+                if memory is not None:
+                    memory.set(key, value)
+                return value
+    value = compute()
+    if memory is not None:
+        memory.set(key, value)
+    if disk is not None:
+        disk.set(key, value)
+    return value
+
+
+# getInfo results indexed by the serialization of the computed object
+INFO_CACHE = LRUCache(512, ttl=3600)
+
+
+def cachedInfo(obj, refresh=False, persist=False):
+    """ Get the information of a computed object (`obj.getInfo()`) only if
+    the same expression has not been requested already. The results are kept
+    in INFO_CACHE (adjust its `maxsize` and `ttl` as needed) and, if
+    `persist` is True, in the disk cache if enabled. They must not be
+    modified
+
+    :param obj: the object to get the information from
+    :type obj: ee.ComputedObject
+    :param refresh: request the information even if it is cached
+    :type refresh: bool
+    :param persist: keep the information in the disk cache (see `cached`)
+    :type persist: bool
+    """
+    key = make_hash('getInfo', obj.serialize())
+    return cached(key, obj.getInfo, INFO_CACHE, refresh, persist)
@@ -10,6 +10,7 @@ import base64
 import ee
 from geetools import tools, utils
 import pandas as pd
+from .cache import cachedInfo
 
 # TODO: make not plotted bands values appear on tooltip
 # TODO: give capability to plot a secondary axis with other data
@@ -226,7 +227,7 @@ class Image(object):
 
         # first image (for getting bands and properties)
         first = ee.Image(imageCollection.first())
-        allbands = first.bandNames().getInfo()
+        allbands = cachedInfo(first.bandNames())
 
         # scale
         if not scale:
@@ -460,7 +461,7 @@ class Image(object):
         :return: a chart
         :rtype: pygal.XY
         """
-        allbands = image.bandNames().getInfo()
+        allbands = cachedInfo(image.bandNames())
 
         xProperty_is_band = xProperty in allbands
 
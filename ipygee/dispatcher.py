@@ -9,15 +9,18 @@ by ee.ComputedObject.getInfo(), process it and return an ipywidget
 import ee
 from ipywidgets import *
 from . import utils
-from geetools.ui.dispatcher import belongToEE
 from time import time
 import sys
 import traceback
 from .widgets import ErrorAccordion
+from .cache import cachedInfo, is_asset_load
 from datetime import datetime
 
 DISPATCHERS = dict()
 
+# number of elements (features, images) shown in each page of a collection
+PAGE_SIZE = 50
+
 
 # HELPERS
 def order(d):
@@ -81,16 +84,79 @@ def set_container(container, eewidget):
         container.selected_index = None
 
 
-def cancel(thread, acc):
-    """ Cancel a thread and set the title of the first element of accordion
-       as CANCELLED """
-    if thread.isAlive():
-        thread.terminate()
+def belongToEE(eeobject):
+    """ Determine if the parsed object belongs to the Earth Engine API. The
+    same as `geetools.ui.dispatcher.belongToEE`, which would import all
+    geetools (and pandas) """
+    module = getattr(eeobject, '__module__', None)
+    parent = module.split('.')[0] if module else None
+    return parent == ee.__name__
+
+
+def lazy_accordion(title, build):
+    """ Create an Accordion with a placeholder child. The actual child is
+    built calling `build()` the first time the Accordion is expanded
+
+    :param title: the title of the Accordion
+    :type title: str
+    :param build: a function that takes no arguments and returns a widget
+    :type build: function
+    """
+    acc = Accordion([Label('Loading...')])
+    acc.set_title(0, title)
+    acc.selected_index = None
+
+    def expand(change):
+        if change['new'] is None:
+            return
+        acc.unobserve(expand, names='selected_index')
+        try:
+            widget = build()
+        except Exception as e:
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            trace = traceback.format_exception(exc_type, exc_value,
+                                               exc_traceback)
+            widget = ErrorAccordion(e, trace)
+        acc.children = [widget]
+
+    acc.observe(expand, names='selected_index')
+    return acc
 
-    while True:
-        if not thread.isAlive():
-            acc.set_title(0, 'CANCELLED')
-            break
+
+def paged(size, fetch, build, page_size=None):
+    """ Create a VBox that shows the elements of a sequence by pages. The
+    next page is fetched and built when the user asks for it
+
+    :param size: total number of elements
+    :type size: int
+    :param fetch: a function that takes an offset and a count and returns
+        a list of elements
+    :type fetch: function
+    :param build: a function that takes the index of an element and the
+        element and returns a widget
+    :type build: function
+    :param page_size: number of elements for each page. Defaults to
+        PAGE_SIZE
+    :type page_size: int
+    """
+    page_size = page_size or PAGE_SIZE
+    box = VBox()
+    more = Button(description='Show more')
+    rows = []
+
+    def next_page(button=None):
+        offset = len(rows)
+        more.disabled = True
+        count = min(page_size, size - offset)
+        for i, element in enumerate(fetch(offset, count)):
+            rows.append(build(offset + i, element))
+        more.disabled = False
+        more.description = 'Show more ({} of {})'.format(len(rows), size)
+        box.children = rows + [more] if len(rows) < size else list(rows)
+
+    more.on_click(next_page)
+    next_page()
+    return box
 
 
 def register(*names):
@@ -98,8 +164,8 @@ def register(*names):
     def wrap(func):
         for name in names:
             DISPATCHERS[name] = func
-        def wrap2(info):
-            return func(info)
+        def wrap2(info, *args, **kwargs):
+            return func(info, *args, **kwargs)
         return wrap2
     return wrap
 
@@ -114,17 +180,60 @@ class EEWidget(object):
         self.processing_time = processing_time
 
 
+def page_collection(collection, page_size=None, refresh=False):
+    """ Get the information of a collection with only its first page of
+    elements and its size in a single request. Next pages are requested
+    with `toList(count, offset)`
+
+    :param collection: the collection
+    :type collection: ee.Collection
+    :param page_size: number of elements of the first page. Defaults to
+        PAGE_SIZE
+    :type page_size: int
+    :param refresh: do not use the cached information (see `cachedInfo`)
+    :type refresh: bool
+    :return: (info, size, fetch) where fetch is a function that takes an
+        offset and a count and returns the information of those elements
+    :rtype: tuple
+    """
+    page_size = page_size or PAGE_SIZE
+    result = cachedInfo(ee.Dictionary({
+        'size': collection.size(),
+        'head': collection.limit(page_size)
+    }), refresh)
+    info = result['head']
+    first = info['features']
+
+    def fetch(offset, count):
+        if offset + count <= len(first):
+            return first[offset:offset+count]
+        return cachedInfo(collection.toList(count, offset), refresh)
+
+    return info, result['size'], fetch
+
+
 # GENERAL DISPATCHER
-def dispatch(obj):
-    """ General dispatcher """
+def dispatch(obj, refresh=False):
+    """ General dispatcher
+
+    :param refresh: request the information of EE objects even if it has
+        been requested before (see `cachedInfo`)
+    :type refresh: bool
+    """
     local_type = obj.__class__.__name__
 
     start = time()
 
     try:
         # Create Widget
-        if belongToEE(obj):
-            info = obj.getInfo()
+        if isinstance(obj, ee.Collection):
+            # do not download all elements, only the first page
+            info, size, fetch = page_collection(obj, refresh=refresh)
+            obj_type = info['type']
+            widget = collection(info, size, fetch)
+        elif belongToEE(obj):
+            # only the information of assets loaded by ID is persisted
+            info = cachedInfo(obj, refresh, persist=is_asset_load(obj))
             try:
                 obj_type = info['type']
             except:
@@ -189,6 +298,14 @@ def number(info):
     return HTML(str(info))
 
 
+def nested(val):
+    """ Dispatch a value inside a container titled with its type """
+    container, _ = create_container()
+    eewidget = dispatch(val)
+    set_container(container, eewidget)
+    return container
+
+
 @register('Dictionary', 'dict', 'List', 'list', 'tuple')
 def iterable(info):
     """ Dispatch Iterables (list and dict) """
@@ -208,17 +325,10 @@ def iterable(info):
                 html = '<div style="border:solid 1px; padding-left:5px;"><strong>{}:</strong> {}</div>'
                 container = HTML(html.format(key, dispatch(val).widget.value))
             else:
-                container = dispatch(val).widget
-                container = Accordion([container])
-                container.set_title(0, key)
-                container.selected_index = None
+                container = lazy_accordion(
+                    key, lambda val=val: dispatch(val).widget)
         else:
-            container, _ = create_container()
-            eewidget = dispatch(val)
-            set_container(container, eewidget)
-            container = Accordion([container])
-            container.set_title(0, key)
-            container.selected_index = None
+            container = lazy_accordion(key, lambda val=val: nested(val))
         elements.append(container)
     widget.children = elements
 
@@ -371,8 +481,17 @@ def feature(info):
 
 
 @register('FeatureCollection', 'ImageCollection')
-def collection(info):
-    """ Dispatch a Collection """
+def collection(info, size=None, fetch=None):
+    """ Dispatch a Collection
+
+    :param info: the information of the collection. If `size` is given, its
+        features are only the first page
+    :param size: the total number of elements in the collection
+    :type size: int
+    :param fetch: a function that takes an offset and a count and returns
+        the information of those elements (see `page_collection`)
+    :type fetch: function
+    """
     try:
         fcid = info['id']
     except KeyError:
@@ -386,36 +505,33 @@ def collection(info):
     # dispatch properties
     props = info.get('properties')
     if props:
-        properties = dispatch(info['properties']) # acc
+        properties = lambda: dispatch(props).widget # acc
     else:
-        properties = dispatch('{} has no properties'.format(info.get('type')))
-    properties_acc = Accordion([properties.widget])
-    properties_acc.set_title(0, 'Properties')
-    properties_acc.selected_index = None
+        properties = lambda: dispatch(
+            '{} has no properties'.format(info.get('type'))).widget
+    properties_acc = lazy_accordion('Properties', properties)
 
-    # Features
+    # Features (dispatched by page, each one when expanded)
     features = info['features']
+    if size is None:
+        size = len(features)
+    if fetch is None:
+        fetch = lambda offset, count: features[offset:offset+count]
+
+    def feature_row(i, feat):
+        return lazy_accordion(str(i), lambda: dispatch(feat).widget)
 
-    features_children = []
-    for i, feat in enumerate(features):
-        featacc = dispatch(feat).widget
-        acc = Accordion([featacc])
-        acc.set_title(0, str(i))
-        acc.selected_index = None
-        features_children.append(acc)
+    def features_page():
+        return paged(size, fetch, feature_row)
 
-    features_wid = VBox(features_children)
-    features_acc = Accordion([features_wid])
     title = 'Features' if info['type'] == 'FeatureCollection' else 'Images'
-    features_acc.set_title(0, title)
-    features_acc.selected_index = None
+    title = '{} ({})'.format(title, size)
+    features_acc = lazy_accordion(title, features_page)
 
     if info['type'] == 'FeatureCollection':
         # columns
-        columns = dispatch(info['columns']).widget # acc
-        columns_acc = Accordion([columns])
-        columns_acc.set_title(0, 'Columns')
-        columns_acc.selected_index = None
+        columns_acc = lazy_accordion(
+            'Columns', lambda: dispatch(info['columns']).widget) # acc
 
         widgets = [idlabel, columns_acc, properties_acc, features_acc]
     else:
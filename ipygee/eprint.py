@@ -3,43 +3,82 @@
 """ Print a EE Object in the Jupyter environment """
 
 from ipywidgets import *
-from . import dispatcher, threading
+from . import dispatcher
+from .threading import CancelToken, Cancelled
 from IPython.display import display
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
 
-CONFIG = {'do_async': True}
+# pool_size: maximum number of objects processed at the same time. The rest
+# wait in the executor's queue in the order they were printed
+CONFIG = {'do_async': True, 'pool_size': 4}
 
+_EXECUTOR = None
+_EXECUTOR_LOCK = Lock()
 
-def worker(obj, container):
+
+def get_executor():
+    """ Get the executor shared by all eprint calls """
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=CONFIG['pool_size'])
+        return _EXECUTOR
+
+
+def worker(obj, container, token=None, refresh=False):
     """ The worker to work in a Thread or not """
-    eewidget = dispatcher.dispatch(obj)
+    try:
+        if token:
+            token.check()
+        eewidget = dispatcher.dispatch(obj, refresh)
+        if token:
+            token.check()
+    except Cancelled:
+        return
     dispatcher.set_container(container, eewidget)
 
 
-def process_object(obj, do_async):
+def cancel(future, container, token):
+    """ Cancel the processing of an object. If it is still in the queue it
+    will not be processed, if it is running its result will be dropped """
+    token.cancel()
+    future.cancel()
+    container.set_title(0, 'CANCELLED')
+
+
+def process_object(obj, do_async, refresh=False):
     """ Process one object for printing """
     if isinstance(obj, (str, int, float)):
         return Label(str(obj))
     else:
         if do_async:
             container, button = dispatcher.create_container(True)
-            thread = threading.Thread(target=worker, args=(obj, container))
-            button.on_click(lambda but: dispatcher.cancel(thread, container))
-            thread.start()
+            token = CancelToken()
+            future = get_executor().submit(worker, obj, container, token,
+                                           refresh)
+            button.on_click(lambda but: cancel(future, container, token))
         else:
             container, _ = dispatcher.create_container(False)
-            worker(obj, container)
+            worker(obj, container, refresh=refresh)
         return container
 
 
-def getInfo(obj, do_async=None):
-    """ Get Information Widget for the parsed EE object """
+def getInfo(obj, do_async=None, refresh=False):
+    """ Get Information Widget for the parsed EE object
+
+    :param refresh: request the information even if the same object has
+        been printed before (see `ipygee.cache.cachedInfo`)
+    :type refresh: bool
+    """
     if do_async is None:
         do_async = CONFIG.get('do_async')
 
-    return process_object(obj, do_async)
+    return process_object(obj, do_async, refresh)
 
 
-def eprint(*objs, do_async=None, container=None):
+def eprint(*objs, do_async=None, container=None, refresh=False):
     """ Print EE Objects. Similar to `print(object.getInfo())` but returns a
     widget for Jupyter notebooks
 
@@ -48,19 +87,79 @@ def eprint(*objs, do_async=None, container=None):
     :param container: any container widget
         (see https://ipywidgets.readthedocs.io/en/stable/examples/Widget%20List.html#Container/Layout-widgets)
     :type container: ipywidget.Widget
+    :param refresh: request the information even if the same object has
+        been printed before (see `ipygee.cache.cachedInfo`)
+    :type refresh: bool
     """
     if container is None:
         container = VBox()
 
     children = []
     for obj in objs:
-        widget = getInfo(obj, do_async)
+        widget = getInfo(obj, do_async, refresh)
         children.append(widget)
         container.children = children
 
     display(container)
 
 
-def set_eprint_async(do_async):
-    """ Set the global async for eprint """
-    CONFIG['do_async'] = do_async
\ No newline at end of file
+async def eprint_async(*objs, container=None, refresh=False):
+    """ Print EE Objects without blocking the event loop. The objects are
+    processed in the shared executor (see `set_eprint_async` for its size)
+    and each container is filled as soon as its object is ready
+
+    Usage:
+
+    await eprint_async(image, collection)
+
+    :param container: any container widget
+    :type container: ipywidget.Widget
+    :param refresh: request the information even if the same object has
+        been printed before (see `ipygee.cache.cachedInfo`)
+    :type refresh: bool
+    :return: the container
+    """
+    if container is None:
+        container = VBox()
+
+    loop = asyncio.get_running_loop()
+
+    async def fill(obj, acc):
+        eewidget = await loop.run_in_executor(get_executor(),
+                                              dispatcher.dispatch, obj,
+                                              refresh)
+        dispatcher.set_container(acc, eewidget)
+
+    children = []
+    pending = []
+    for obj in objs:
+        if isinstance(obj, (str, int, float)):
+            children.append(Label(str(obj)))
+        else:
+            acc, _ = dispatcher.create_container(False)
+            children.append(acc)
+            pending.append(fill(obj, acc))
+    container.children = children
+
+    display(container)
+    await asyncio.gather(*pending)
+    return container
+
+
+def set_eprint_async(do_async, pool_size=None):
+    """ Set the global async for eprint
+
+    :param do_async: process the objects in the background
+    :type do_async: bool
+    :param pool_size: maximum number of objects processed at the same time
+    :type pool_size: int
+    """
+    global _EXECUTOR
+    CONFIG['do_async'] = do_async
+    if pool_size is not None and pool_size != CONFIG['pool_size']:
+        CONFIG['pool_size'] = pool_size
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is not None:
+                # running and queued objects finish in the old executor
+                _EXECUTOR.shutdown(wait=False)
+                _EXECUTOR = None
\ No newline at end of file
@@ -4,9 +4,11 @@
 
 import ee
 import ipyleaflet
-from ipywidgets import Layout, HTML, Accordion
+from ipywidgets import Layout, HTML, Accordion, IntProgress, Button, HBox, \
+    Label
 from traitlets import *
 from collections import OrderedDict
+from contextlib import contextmanager
 from .tasks import TaskManager
 from .assets import AssetManager
 from geetools import tools, utils
@@ -17,7 +19,14 @@ import traceback
 from .maptools import *
 from .widgets import ErrorAccordion
 from .utils import *
+from .cache import LRUCache, cachedInfo
+from .profiler import ProfilerWidget
 import re
+import sys
+import asyncio
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
 ZOOM_SCALES = {
@@ -30,6 +39,12 @@ ZOOM_SCALES = {
 class Map(ipyleaflet.Map):
     tab_children_dict = Dict()
     EELayers = Dict()
+    POOL_SIZE = 8
+    INSPECTOR_SINGLE_REQUEST = True
+    INSPECTOR_DEBOUNCE = 0.3
+    SIMPLIFY_ZOOM_STEP = 2
+    SIMPLIFY_DEBOUNCE = 0.3
+    VIEWPORT_DEBOUNCE = 0.5
 
     def __init__(self, tabs=('Inspector', 'Layers'), **kwargs):
         # Change defaults
@@ -40,6 +55,28 @@ class Map(ipyleaflet.Map):
         super(Map, self).__init__(**kwargs)
         self.is_shown = False
 
+        # EELayers staged inside a batch (see `batch`)
+        self._batch_layers = None
+
+        # Inspector results indexed by layer, snapped coordinates and zoom
+        self._inspector_cache = LRUCache(maxsize=512)
+
+        # Inspector clicks (see `handle_inspector`)
+        self._inspector_generation = 0
+        self._inspector_timer = None
+        self._inspector_lock = threading.Lock()
+
+        # Geometries simplified by zoom (see `addGeometry`) indexed by name
+        self._simplified = OrderedDict()
+        self._simplify_generation = 0
+        self._simplify_timer = None
+        self._simplify_lock = threading.Lock()
+
+        # Vector layers loaded by viewport (see `addVectorLayer`)
+        self._viewport_layers = OrderedDict()
+        self._viewport_timer = None
+        self._viewport_lock = threading.Lock()
+
         # Width and Height
         self.width = kwargs.get('width', None)
         self.height = kwargs.get('height', None)
@@ -91,8 +128,14 @@ class Map(ipyleaflet.Map):
                         'Layers': None,
                         # 'Assets': None,
                         'Tasks': None,
+                        'Profiler': None,
                         }
 
+            # Profiler (opt-in, it records requests only while recording)
+            if 'Profiler' in tabs:
+                self.profiler_widget = ProfilerWidget()
+                widgets['Profiler'] = self.profiler_widget
+
             # Add tabs and handlers
             for tab in tabs:
                 if tab in widgets.keys():
@@ -100,7 +143,7 @@ class Map(ipyleaflet.Map):
                     handler = handlers[tab]
                     self.addTab(tab, handler, widget)
                 else:
-                    raise ValueError('Tab {} is not recognized. Choose one of {}'.format(tab, widgets.keys()))
+                    raise ValueError('Tab {} is not recognized. Choose one of {}'.format(tab, handlers.keys()))
 
             # First handler: Inspector
             self.on_interaction(self.handlers[tabs[0]])
@@ -113,6 +156,24 @@ class Map(ipyleaflet.Map):
         # create EELayers
         self.EELayers = OrderedDict()
 
+    def _edit_EELayers(self):
+        """ Get the EELayers to modify. Outside a batch it is a copy that
+        must be set back with `_set_EELayers`, inside a batch it is the staged
+        dict which is modified in place """
+        if self._batch_layers is None:
+            return copy(self.EELayers)
+        else:
+            return self._batch_layers
+
+    def _set_EELayers(self, layers):
+        """ Set EELayers. Inside a batch observers are notified only when the
+        batch ends """
+        if self._batch_layers is None:
+            self.EELayers = layers
+        elif layers is not self._batch_layers:
+            self._batch_layers.clear()
+            self._batch_layers.update(layers)
+
     def _add_EELayer(self, name, data):
         """ Add a pair of name, data to EELayers. Data must be:
 
@@ -122,16 +183,64 @@ class Map(ipyleaflet.Map):
         - layer: ipyleaflet layer
 
         """
-        copyEELayers = copy(self.EELayers)
+        copyEELayers = self._edit_EELayers()
+        self._forget_EELayer(copyEELayers.get(name), data)
         copyEELayers[name] = data
-        self.EELayers = copyEELayers
+        self._set_EELayers(copyEELayers)
+
+    def _add_EELayers(self, layers):
+        """ Add many pairs of name, data to EELayers in a single update.
+        See `_add_EELayer` for the structure of data
+
+        :param layers: pairs of name, data
+        :type layers: OrderedDict
+        """
+        copyEELayers = self._edit_EELayers()
+        for name, data in layers.items():
+            self._forget_EELayer(copyEELayers.get(name), data)
+        copyEELayers.update(layers)
+        self._set_EELayers(copyEELayers)
 
     def _remove_EELayer(self, name):
         """ remove layer from EELayers """
-        copyEELayers = copy(self.EELayers)
+        copyEELayers = self._edit_EELayers()
         if name in copyEELayers:
-            copyEELayers.pop(name)
-        self.EELayers = copyEELayers
+            self._forget_EELayer(copyEELayers.pop(name))
+        self._set_EELayers(copyEELayers)
+
+    def _forget_EELayer(self, old, new=None):
+        """ Remove cached data of an EELayer that is removed or replaced """
+        if old is not None and old is not new:
+            oldid = id(old['object'])
+            self._inspector_cache.invalidate_if(lambda key: key[0] == oldid)
+
+    @contextmanager
+    def batch(self):
+        """ Context manager to add, remove or move many layers updating the
+        Map, the Inspector and the Layers widget only once at the end
+
+        Usage:
+
+        with Map.batch():
+            Map.addLayer(image1, name='first')
+            Map.addLayer(image2, name='second')
+        """
+        if self._batch_layers is not None:  # nested batch
+            yield self
+            return
+
+        original = self.EELayers
+        self._batch_layers = copy(original)
+        # the staged dict is equal to the original so this does not notify,
+        # but makes reading EELayers inside the batch see the changes
+        self.set_trait('EELayers', self._batch_layers)
+        try:
+            yield self
+        finally:
+            staged = self._batch_layers
+            self._batch_layers = None
+            if staged != original:
+                self._notify_trait('EELayers', original, staged)
 
     def addBasemap(self, name, url, **kwargs):
         """ Add a basemap with the given URL """
@@ -192,7 +301,7 @@ class Map(ipyleaflet.Map):
                 values[i] = ival_before
 
                 newlayers = OrderedDict(zip(names, values))
-                self.EELayers = newlayers
+                self._set_EELayers(newlayers)
 
     @observe('EELayers')
     def _ob_EELayers(self, change):
@@ -216,6 +325,54 @@ class Map(ipyleaflet.Map):
         self.layers_widget.selector.options = {}
         self.layers_widget.selector.options = new # self.EELayers
 
+    @observe('zoom')
+    def _ob_zoom(self, change):
+        """ Simplify again the geometries added with `maxVertices` when the
+        zoom changes `SIMPLIFY_ZOOM_STEP` levels or more, once it stops
+        changing for SIMPLIFY_DEBOUNCE seconds """
+        if not getattr(self, '_simplified', None):
+            return
+
+        # Every zoom change gets a new generation. Results of older zooms
+        # are discarded
+        with self._simplify_lock:
+            self._simplify_generation += 1
+            generation = self._simplify_generation
+            if self._simplify_timer is not None:
+                self._simplify_timer.cancel()
+            self._simplify_timer = threading.Timer(
+                self.SIMPLIFY_DEBOUNCE, self._resimplify,
+                args=(int(change['new']), generation))
+            self._simplify_timer.start()
+
+    def _resimplify(self, zoom, generation):
+        """ Simplify the geometries for `zoom`. Stop as soon as the zoom is
+        not the current one """
+        def is_current():
+            return generation == self._simplify_generation
+
+        for name, state in list(self._simplified.items()):
+            if not is_current():
+                return
+            EELayer = self.EELayers.get(name)
+            if EELayer is None or EELayer['layer'] is not state['layer']:
+                # the layer has been removed or replaced
+                self._simplified.pop(name, None)
+                continue
+            if abs(zoom - state['zoom']) < self.SIMPLIFY_ZOOM_STEP:
+                continue
+            try:
+                geojson, _ = getGeojson(state['object'], ZOOM_SCALES[zoom],
+                                        state['maxVertices'])
+            except Exception as e:
+                print('Error simplifying {}: {}'.format(name, e))
+                continue
+            with self._simplify_lock:
+                if not is_current():
+                    return
+                state['layer'].data = geojson
+                state['zoom'] = zoom
+
     @property
     def addedImages(self):
         return sum(
@@ -299,18 +456,22 @@ class Map(ipyleaflet.Map):
             # Get URL, attribution & vis params
             params = getImageTile(image, visParams, show, opacity)
 
+        # self._add_EELayer(name, EELayer)
+        # return name
+        return self._image_layer(image, params, name)
+
+    @staticmethod
+    def _image_layer(image, params, name):
+        """ Make the EELayer of an Image out of the parameters returned by
+        `getImageTile`. It makes no requests """
         layer = ipyleaflet.TileLayer(url=params['url'],
                                      attribution=params['attribution'],
                                      name=name)
 
-        EELayer = {'type': 'Image',
-                   'object': image,
-                   'visParams': params['visParams'],
-                   'layer': layer}
-
-        # self._add_EELayer(name, EELayer)
-        # return name
-        return EELayer
+        return {'type': 'Image',
+                'object': image,
+                'visParams': params['visParams'],
+                'layer': layer}
 
     def addMarker(self, marker, visParams=None, name=None, show=True,
                   opacity=None, replace=True,
@@ -333,7 +494,8 @@ class Map(ipyleaflet.Map):
 
     def addFeature(self, feature, visParams=None, name=None, show=True,
                    opacity=None, replace=True,
-                   inspect={'data':None, 'reducer':None, 'scale':None}):
+                   inspect={'data':None, 'reducer':None, 'scale':None},
+                   maxVertices=None):
         """ Add a Feature to the Map
 
         :param feature: the Feature to add to Map
@@ -348,6 +510,10 @@ class Map(ipyleaflet.Map):
             :reducer: the reducer to use
             :scale: the scale to reduce
         :type inspect: dict
+        :param maxVertices: if given, the geometry is simplified according to
+            the zoom level and keeping at most this number of vertices. It is
+            simplified again when the zoom changes
+        :type maxVertices: int
         :return: the name of the added layer
         :rtype: str
         """
@@ -361,7 +527,13 @@ class Map(ipyleaflet.Map):
             else:
                 self.removeLayer(thename)
 
-        params = getGeojsonTile(feature, thename, inspect)
+        if maxVertices:
+            zoom = int(self.zoom)
+            params = getGeojsonTile(feature, thename, inspect,
+                                    ZOOM_SCALES[zoom], maxVertices)
+        else:
+            params = getGeojsonTile(feature, thename, inspect)
+
         layer = ipyleaflet.GeoJSON(data=params['geojson'],
                                    name=thename,
                                    popup=HTML(params['pop']))
@@ -370,11 +542,17 @@ class Map(ipyleaflet.Map):
                                     'object': feature,
                                     'visParams': None,
                                     'layer': layer})
+        if maxVertices:
+            self._simplified[thename] = {'object': feature,
+                                         'layer': layer,
+                                         'maxVertices': maxVertices,
+                                         'zoom': zoom}
         return thename
 
     def addGeometry(self, geometry, visParams=None, name=None, show=True,
                     opacity=None, replace=True,
-                    inspect={'data':None, 'reducer':None, 'scale':None}):
+                    inspect={'data':None, 'reducer':None, 'scale':None},
+                    maxVertices=None):
         """ Add a Geometry to the Map
 
         :param geometry: the Geometry to add to Map
@@ -389,6 +567,10 @@ class Map(ipyleaflet.Map):
             :reducer: the reducer to use
             :scale: the scale to reduce
         :type inspect: dict
+        :param maxVertices: if given, the geometry is simplified according to
+            the zoom level and keeping at most this number of vertices. It is
+            simplified again when the zoom changes
+        :type maxVertices: int
         :return: the name of the added layer
         :rtype: str
         """
@@ -402,15 +584,26 @@ class Map(ipyleaflet.Map):
             else:
                 self.removeLayer(thename)
 
-        params = getGeojsonTile(geometry, thename, inspect)
+        if maxVertices:
+            zoom = int(self.zoom)
+            params = getGeojsonTile(geometry, thename, inspect,
+                                    ZOOM_SCALES[zoom], maxVertices)
+        else:
+            params = getGeojsonTile(geometry, thename, inspect)
+
         layer = ipyleaflet.GeoJSON(data=params['geojson'],
                                    name=thename,
                                    popup=HTML(params['pop']))
 
         self._add_EELayer(thename, {'type': 'Geometry',
                                     'object': geometry,
-                                    'visParams':None,
+                                    'visParams': None,
                                     'layer': layer})
+        if maxVertices:
+            self._simplified[thename] = {'object': geometry,
+                                         'layer': layer,
+                                         'maxVertices': maxVertices,
+                                         'zoom': zoom}
         return thename
 
     def addFeatureLayer(self, feature, visParams=None, name=None, show=True,
@@ -471,6 +664,229 @@ class Map(ipyleaflet.Map):
                                     'layer': layer})
         return thename
 
+    def addVectorLayer(self, collection, visParams=None, name=None,
+                       replace=True, pageSize=500, maxFeatures=5000,
+                       viewport=False):
+        """ Add a FeatureCollection to the Map as vectors (GeoJSON). Features
+        are retrieved in pages in a background thread and each page is shown
+        as soon as it arrives. While loading, a progress bar with a button to
+        cancel is shown on the Map.
+
+        If `viewport` is True, only the features that intersect the current
+        view are loaded, and more are loaded when the view changes. The
+        progress bar is shown while each view loads and its Cancel button
+        stops loading more features for this layer
+
+        :param collection: the FeatureCollection to add
+        :type collection: ee.FeatureCollection
+        :param visParams: visualization parameters. Can have the following
+            arguments: outline_color (or border_color), fill_color, outline
+        :type visParams: dict
+        :param name: name for the layer
+        :type name: str
+        :param pageSize: number of features retrieved in each request
+        :type pageSize: int
+        :param maxFeatures: maximum number of features to add. With `viewport`
+            it is the maximum number of features loaded over all views
+        :type maxFeatures: int
+        :param viewport: load features by viewport. In this case `pageSize`
+            is the maximum number of features of each map tile
+        :type viewport: bool
+        :return: the name of the added layer
+        :rtype: str
+        """
+        visParams = visParams if visParams else {}
+        collection = ee.FeatureCollection(collection)
+        thename = name if name else 'FeatureCollection {}'.format(
+            self.addedGeometries)
+
+        # Check if layer exists
+        if thename in self.EELayers.keys():
+            if not replace:
+                print("Layer with name '{}' exists already, please choose another name".format(thename))
+                return
+            else:
+                self.removeLayer(thename)
+
+        fill_color = visParams.get('fill_color', None)
+        if 'outline_color' in visParams:
+            out_color = visParams['outline_color']
+        elif 'border_color' in visParams:
+            out_color = visParams['border_color']
+        else:
+            out_color = 'black'
+        style = {'color': out_color,
+                 'weight': visParams.get('outline', 2),
+                 'fillColor': fill_color or out_color,
+                 'fillOpacity': 0.5 if fill_color else 0}
+
+        group = ipyleaflet.LayerGroup(name=thename)
+        self._add_EELayer(thename, {'type': 'FeatureCollection',
+                                    'object': collection,
+                                    'visParams': visParams,
+                                    'layer': group})
+
+        cancelled = threading.Event()
+
+        if viewport:
+            self._viewport_layers[thename] = {'collection': collection,
+                                              'group': group,
+                                              'style': style,
+                                              'limit': pageSize,
+                                              'maxFeatures': maxFeatures,
+                                              'cancelled': cancelled,
+                                              'tiles': {},
+                                              'seen': set(),
+                                              'loaded': 0}
+            thread = threading.Thread(target=self._load_viewport)
+            thread.start()
+            return thename
+
+        # Progress
+        control, progress = self._progress_control(thename, maxFeatures,
+                                                   cancelled)
+
+        def add_page(features):
+            data = {'type': 'FeatureCollection', 'features': features}
+            group.add_layer(ipyleaflet.GeoJSON(data=data, style=style))
+            progress.value += len(features)
+
+        def load():
+            try:
+                # first page and size in the same request
+                first = ee.Dictionary({
+                    'size': collection.size(),
+                    'features': collection.toList(min(pageSize, maxFeatures))
+                }).getInfo()
+                total = min(first['size'], maxFeatures)
+                progress.max = max(total, 1)
+                add_page(first['features'])
+
+                offset = len(first['features'])
+                while offset < total and not cancelled.is_set():
+                    count = min(pageSize, total-offset)
+                    features = collection.toList(count, offset).getInfo()
+                    if not features:
+                        break
+                    add_page(features)
+                    offset += len(features)
+            except Exception as e:
+                print('Error loading {}: {}'.format(thename, e))
+            finally:
+                self.remove_control(control)
+
+        thread = threading.Thread(target=load)
+        thread.start()
+
+        return thename
+
+    def _progress_control(self, name, maximum, cancelled):
+        """ Add a progress bar with a Cancel button (that sets `cancelled`)
+        to the Map
+
+        :return: the control (to remove it when finished) and the progress
+            bar
+        """
+        label = Label('Loading {}...'.format(name))
+        progress = IntProgress(min=0, max=max(maximum, 1), value=0)
+        cancel = Button(description='Cancel', layout=Layout(width='80px'))
+        control = ipyleaflet.WidgetControl(
+            widget=HBox([label, progress, cancel]), position='bottomleft')
+        cancel.on_click(lambda button: cancelled.set())
+        self.add_control(control)
+        return control, progress
+
+    @observe('bounds', 'zoom')
+    def _ob_viewport(self, change):
+        """ Load the viewport layers when the view changes, once it stops
+        changing for VIEWPORT_DEBOUNCE seconds """
+        if not getattr(self, '_viewport_layers', None):
+            return
+        if self._viewport_timer is not None:
+            self._viewport_timer.cancel()
+        self._viewport_timer = threading.Timer(self.VIEWPORT_DEBOUNCE,
+                                               self._load_viewport)
+        self._viewport_timer.start()
+
+    @staticmethod
+    def _tile_loaded(tiles, key):
+        """ Determine if the features of a tile have been loaded, either in
+        the tile itself or in a complete tile of a lower zoom """
+        if key in tiles:
+            return True
+        zoom, x, y = key
+        while zoom > 0:
+            zoom, x, y = zoom-1, x//2, y//2
+            if tiles.get((zoom, x, y)):
+                return True
+        return False
+
+    def _load_viewport(self):
+        """ Load the features of the viewport layers that intersect the
+        current view and have not been loaded yet """
+        if not self.bounds:
+            return
+
+        with self._viewport_lock:
+            keys = tileKeys(self.bounds, int(self.zoom))
+
+            for name, state in list(self._viewport_layers.items()):
+                EELayer = self.EELayers.get(name)
+                if EELayer is None or EELayer['layer'] is not state['group']:
+                    # the layer has been removed or replaced
+                    self._viewport_layers.pop(name, None)
+                    continue
+
+                remaining = state['maxFeatures'] - state['loaded']
+                if remaining <= 0 or state['cancelled'].is_set():
+                    continue
+
+                tiles = state['tiles']
+                missing = [key for key in keys if not self._tile_loaded(tiles, key)]
+                if not missing:
+                    continue
+
+                # all missing tiles in a single request
+                collection = state['collection']
+                limit = min(state['limit'], remaining)
+                request = {}
+                for key in missing:
+                    rect = ee.Geometry.Rectangle(tileBounds(key))
+                    request['{}/{}/{}'.format(*key)] = \
+                        collection.filterBounds(rect).toList(limit)
+
+                control, progress = self._progress_control(
+                    name, state['maxFeatures'], state['cancelled'])
+                progress.value = state['loaded']
+                try:
+                    result = ee.Dictionary(request).getInfo()
+                except Exception as e:
+                    print('Error loading {}: {}'.format(name, e))
+                    continue
+                finally:
+                    self.remove_control(control)
+                if state['cancelled'].is_set():
+                    continue
+
+                features = []
+                for key in missing:
+                    tile_features = result['{}/{}/{}'.format(*key)]
+                    # a tile with less features than the limit is complete
+                    tiles[key] = len(tile_features) < limit
+                    for feat in tile_features:
+                        if state['loaded'] >= state['maxFeatures']:
+                            break
+                        featid = feat.get('id')
+                        if featid is None or featid not in state['seen']:
+                            state['seen'].add(featid)
+                            state['loaded'] += 1
+                            features.append(feat)
+
+                if features:
+                    data = {'type': 'FeatureCollection', 'features': features}
+                    state['group'].add_layer(
+                        ipyleaflet.GeoJSON(data=data, style=state['style']))
+
     def addMosaic(self, collection, visParams=None, name=None, show=False,
                   opacity=None, replace=True):
         """ Add an ImageCollection to EELayer and its mosaic to the Map.
@@ -502,22 +918,40 @@ class Map(ipyleaflet.Map):
         """
         size = collection.size()
         collist = collection.toList(size)
-        n = 0
-        while True:
-            try:
-                img = ee.Image(collist.get(n))
-                extra = dict(position=n)
-                name = utils.makeName(img, namePattern, datePattern, extra=extra)
-                self.addLayer(img, visParams, name.getInfo(), show, opacity,
-                              replace=replace)
+
+        def makeName(n):
+            img = ee.Image(collist.get(n))
+            extra = dict(position=n)
+            return utils.makeName(img, namePattern, datePattern, extra=extra)
+
+        # Get all names in a single request
+        names = ee.List.sequence(0, None, 1, size).map(makeName).getInfo()
+
+        # if the pattern gives the same name to many images keep the first
+        toadd = []
+        seen = set()
+        for n, name in enumerate(names):
+            if name in seen:
+                continue
+            seen.add(name)
+            if replace or name not in self.EELayers.keys():
+                toadd.append((n, name))
+
+        def makeLayer(item):
+            n, name = item
+            img = ee.Image(collist.get(n))
+            params = getImageTile(img, visParams, show, opacity)
+            return name, self._image_layer(img, params, name)
+
+        # Get map ids concurrently
+        layers = OrderedDict()
+        with ThreadPoolExecutor(max_workers=self.POOL_SIZE) as executor:
+            for name, EELayer in executor.map(makeLayer, toadd):
+                layers[name] = EELayer
                 if verbose:
                     print('Adding {} to the Map'.format(name))
-                n += 1
-            except ee.EEException as e:
-                msg = 'List.get: List index must be between'
-                if msg not in str(e):
-                    raise e
-                break
+
+        self._add_EELayers(layers)
 
     def addLayer(self, eeObject, visParams=None, name=None, show=True,
                  opacity=None, replace=True, **kwargs):
@@ -531,8 +965,9 @@ class Map(ipyleaflet.Map):
 
         For ee.Image and ee.ImageCollection see `addImage`
         for ee.Geometry and ee.Feature see `addGeometry`
+        for ee.FeatureCollection with `vector=True` see `addVectorLayer`
         """
-        if name in self.EELayers.keys():
+        if name in self.EELayers.keys() and not replace:
             return None
 
         visParams = visParams if visParams else {}
@@ -551,13 +986,18 @@ class Map(ipyleaflet.Map):
             geom = eeObject if isinstance(eeObject, ee.Geometry) else eeObject.geometry()
             kw = {'visParams':visParams, 'name':name, 'show':show, 'opacity':opacity}
             if kwargs.get('inspect'): kw.setdefault('inspect', kwargs.get('inspect'))
+            if kwargs.get('maxVertices'): kw['maxVertices'] = kwargs['maxVertices']
             self.addGeometry(geom, replace=replace, **kw)
 
         # CASE: ee.Feature & ee.FeatureCollection
         elif isinstance(eeObject, ee.Feature) or isinstance(eeObject, ee.FeatureCollection):
             feat = eeObject
-            kw = {'visParams':visParams, 'name':name, 'show':show, 'opacity':opacity}
-            self.addFeatureLayer(feat, replace=replace, **kw)
+            if kwargs.get('vector') and isinstance(feat, ee.FeatureCollection):
+                self.addVectorLayer(feat, visParams, name, replace,
+                                    viewport=kwargs.get('viewport', False))
+            else:
+                kw = {'visParams':visParams, 'name':name, 'show':show, 'opacity':opacity}
+                self.addFeatureLayer(feat, replace=replace, **kw)
 
         # CASE: ee.ImageCollection
         elif isinstance(eeObject, ee.ImageCollection):
@@ -569,6 +1009,48 @@ class Map(ipyleaflet.Map):
             print("`addLayer` doesn't support adding {} objects to the map".format(type(eeObject)))
 
 
+    async def addLayer_async(self, eeObject, visParams=None, name=None,
+                             show=True, opacity=None, replace=True,
+                             executor=None, **kwargs):
+        """ Add a layer without blocking the event loop. The requests to
+        Earth Engine run in `executor` (the default executor of the loop if
+        None). See `addLayer` for the arguments
+
+        For ee.Image only the requests (map id and default visualization)
+        run in the executor. The layer is made out of their result in the
+        event loop, without requests. Other objects are added in the executor
+        """
+        loop = asyncio.get_running_loop()
+        if isinstance(eeObject, ee.Image):
+            if name in self.EELayers.keys() and not replace:
+                return None
+            vis = visParams if visParams else {}
+            params = await loop.run_in_executor(
+                executor, getImageTile, eeObject, vis, show, opacity)
+            image_name = name if name else 'Image {}'.format(self.addedImages)
+            if image_name in self.EELayers.keys():
+                self.removeLayer(image_name)
+            self._add_EELayer(image_name,
+                              self._image_layer(eeObject, params, image_name))
+        else:
+            await loop.run_in_executor(
+                executor, partial(self.addLayer, eeObject, visParams, name,
+                                  show, opacity, replace, **kwargs))
+
+    def addLayers(self, layers):
+        """ Add many layers to the Map updating it only once. See `addLayer`
+
+        :param layers: arguments for `addLayer`. Each element can be a dict of
+            keyword arguments or a list/tuple of positional arguments
+        :type layers: list
+        """
+        with self.batch():
+            for layer in layers:
+                if isinstance(layer, dict):
+                    self.addLayer(**layer)
+                else:
+                    self.addLayer(*layer)
+
     def removeLayer(self, name):
         """ Remove a layer by its name """
         if name in self.EELayers.keys():
@@ -654,14 +1136,7 @@ class Map(ipyleaflet.Map):
         """
         bounds = getBounds(eeObject)
         if bounds:
-            try:
-                inverse = inverseCoordinates(bounds)
-                centroid = ee.Geometry.Polygon(inverse) \
-                    .centroid().getInfo()['coordinates']
-            except:
-                centroid = [0, 0]
-
-            self.center = inverseCoordinates(centroid)
+            self.center = getBoundsCenter(bounds)
             if zoom:
                 self.zoom = zoom
             else:
@@ -793,142 +1268,260 @@ class Map(ipyleaflet.Map):
         if event == 'click':  # If the user clicked
             # create a point where the user clicked
             point = ee.Geometry.Point(coords)
+            zoom = self.zoom
+            scale = ZOOM_SCALES[zoom]
 
             # Get widget
             thewidget = change['widget'].main  # Accordion
 
+            # Get only Selected Layers in the Inspector Selector
+            selected_layers = OrderedDict(zip(self.inspector_wid.selector.label,
+                                              self.inspector_wid.selector.value))
+            names = list(selected_layers.keys())
+
             # First Accordion row text (name)
-            first = 'Point {} at {} zoom'.format(coords, self.zoom)
-            namelist = [first]
-            # wids4acc = [HTML('')] # first row has no content
-            wids4acc = [point_widget(coords)]
+            first = 'Point {} at {} zoom'.format(coords, zoom)
+            # One row per layer that will be filled when its data arrives
+            namelist = [first] + ['Loading {}...'.format(name) for name in names]
+            wids4acc = [point_widget(coords)] + \
+                       [HTML('wait a second please..') for name in names]
+
+            # Every click gets a new generation. Results of older clicks are
+            # discarded
+            with self._inspector_lock:
+                self._inspector_generation += 1
+                generation = self._inspector_generation
+
+            def is_current():
+                return generation == self._inspector_generation
+
+            def cache_key(name):
+                return self._inspector_key(selected_layers[name], coords, zoom)
+
+            def set_row(i, ty, data, error):
+                name = names[i-1]
+                if error is None:
+                    self._inspector_cache.set(
+                        cache_key(name), (selected_layers[name]['object'], data))
+                if not is_current():
+                    return
+                if error is not None:
+                    wids4acc[i] = error
+                    namelist[i] = 'ERROR at layer {}'.format(name)
+                elif data is None:
+                    wids4acc[i] = None
+                    namelist[i] = None
+                    return
+                else:
+                    wids4acc[i] = self._layer_widget(ty, data)
+                    namelist[i] = name
+                thewidget.children = [w if w is not None else HTML('')
+                                      for w in wids4acc]
+                thewidget.set_title(i, namelist[i])
+
+            def query(name):
+                obj = selected_layers[name]
+                if not is_current():
+                    return obj['type'], None, None
+                try:
+                    data = self._query_layer(obj, point, scale)
+                    return obj['type'], data, None
+                except Exception as e:
+                    exc_type, exc_value, exc_traceback = sys.exc_info()
+                    trace = traceback.format_exception(exc_type, exc_value,
+                                                       exc_traceback)
+                    return obj['type'], None, ErrorAccordion(e, trace)
+
+            def inspect():
+                if not is_current():
+                    return
+
+                thewidget.children = wids4acc
+                for i, n in enumerate(namelist):
+                    thewidget.set_title(i, n)
+
+                # Use data of layers inspected before at the same place
+                pending = OrderedDict()
+                for i, name in enumerate(names, 1):
+                    obj = selected_layers[name]
+                    cached = self._inspector_cache.get(cache_key(name))
+                    if cached is not None and cached[0] is obj['object']:
+                        set_row(i, obj['type'], cached[1], None)
+                    else:
+                        pending[name] = obj
+
+                # Try to get the data of all layers in a single request. If it
+                # fails, query each layer to know which one failed
+                results = None
+                if self.INSPECTOR_SINGLE_REQUEST and pending:
+                    try:
+                        results = self._query_layers(pending, point, scale)
+                    except Exception:
+                        results = None
+
+                if results is not None:
+                    for name, obj in pending.items():
+                        set_row(names.index(name)+1, obj['type'],
+                                results.get(name), None)
+                else:
+                    executor = ThreadPoolExecutor(max_workers=self.POOL_SIZE)
+                    futures = dict((executor.submit(query, name),
+                                    names.index(name)+1) for name in pending)
+                    for future in as_completed(futures):
+                        if not is_current():
+                            # a newer click is being inspected
+                            for f in futures:
+                                f.cancel()
+                            break
+                        set_row(futures[future], *future.result())
+                    executor.shutdown(wait=False)
+
+                if not is_current():
+                    return
+
+                # Remove rows of layers without data at the point
+                children = [w for w in wids4acc if w is not None]
+                titles = [n for n in namelist if n is not None]
+                thewidget.children = children
+                for i, n in enumerate(titles):
+                    thewidget.set_title(i, n)
+
+            # Debounce: only inspect if no other click arrives in the meantime
+            with self._inspector_lock:
+                if self._inspector_timer is not None:
+                    self._inspector_timer.cancel()
+                self._inspector_timer = threading.Timer(
+                    self.INSPECTOR_DEBOUNCE, inspect)
+                self._inspector_timer.start()
+
+    @staticmethod
+    def _inspector_key(obj, coords, zoom):
+        """ Key to cache the Inspector data of a layer. Coordinates are
+        snapped to the scale of the zoom level """
+        step = ZOOM_SCALES[zoom] / 111319.49  # meters to degrees
+        lon, lat = coords[0], coords[1]
+        return (id(obj['object']), zoom,
+                int(round(lon/step)), int(round(lat/step)))
+
+    @staticmethod
+    def _image_values(image, point, scale):
+        """ The values of all bands of an image at a point, computed in the
+        server. Unlike `geetools.tools.image.getValue` it does not request
+        the type of the point
+
+        :rtype: ee.Dictionary
+        """
+        scale = int(scale) if scale else 1
+        return image.reduceRegion(ee.Reducer.first(), point, scale)
+
+    @staticmethod
+    def _query_layer(obj, point, scale):
+        """ Get the data of a layer at a point. Returns None when the layer
+        has no data at the point
+
+        :param obj: an EELayer (see `getLayer`)
+        :type obj: dict
+        :param point: the point to query
+        :type point: ee.Geometry.Point
+        :param scale: the scale to query images
+        :type scale: float
+        """
+        ty = obj['type']
+        eeobject = obj['object']
 
-            # Get only Selected Layers in the Inspector Selector
-            selected_layers = dict(zip(self.inspector_wid.selector.label,
-                                       self.inspector_wid.selector.value))
+        if ty == 'Image':
+            values = Map._image_values(eeobject, point, scale).getInfo()
+            return tools.dictionary.sort(values)
 
-            length = len(selected_layers.keys())
-            i = 1
+        elif ty == 'ImageCollection':
+            return tools.imagecollection.getValues(
+                eeobject, point, scale=scale,
+                properties=['system:time_start'], side='client')
 
-            for name, obj in selected_layers.items(): # for every added layer
-                # Clear children // Loading
-                thewidget.children = [HTML('wait a second please..')]
-                thewidget.set_title(0, 'Loading {} of {}...'.format(i, length))
-                i += 1
+        elif ty == 'Feature':
+            if eeobject.geometry().contains(point).getInfo():
+                return cachedInfo(eeobject)
 
-                # Image
-                if obj['type'] == 'Image':
-                    # Get the image's values
-                    try:
-                        image = obj['object']
-                        values = tools.image.getValue(image, point,
-                                                      scale=ZOOM_SCALES[self.zoom],
-                                                      side='client')
-                        values = tools.dictionary.sort(values)
-                        # Create the content
-                        img_html = ''
-                        for band, value in values.items():
-                            img_html += '<b>{}</b>: {}</br>'.format(band,
-                                                                    value)
-                        wid = HTML(img_html)
-                        # append widget to list of widgets
-                        wids4acc.append(wid)
-                        namelist.append(name)
-                    except Exception as e:
-                        # wid = HTML(str(e).replace('<','{').replace('>','}'))
-                        exc_type, exc_value, exc_traceback = sys.exc_info()
-                        trace = traceback.format_exception(exc_type, exc_value,
-                                                           exc_traceback)
-                        wid = ErrorAccordion(e, trace)
-                        wids4acc.append(wid)
-                        namelist.append('ERROR at layer {}'.format(name))
-
-                # ImageCollection
-                if obj['type'] == 'ImageCollection':
-                    # Get the values from all images
-                    try:
-                        collection = obj['object']
-                        values = tools.imagecollection.getValues(
-                            collection, point, scale=ZOOM_SCALES[self.zoom],
-                            properties=['system:time_start'],
-                            side='client')
-
-                        # header
-                        allbands = [val.keys() for bands, val in values.items()]
-                        bands = []
-                        for bandlist in allbands:
-                            for band in bandlist:
-                                if band not in bands:
-                                    bands.append(band)
-
-                        header = ['image']+bands
-
-                        # rows
-                        rows = []
-                        for imgid, val in values.items():
-                            row = ['']*len(header)
-                            row[0] = str(imgid)
-                            for bandname, bandvalue in val.items():
-                                pos = header.index(bandname) if bandname in header else None
-                                if pos:
-                                    row[pos] = str(bandvalue)
-                            rows.append(row)
-
-                        # Create the content
-                        html = createHTMLTable(header, rows)
-                        wid = HTML(html)
-                        # append widget to list of widgets
-                        wids4acc.append(wid)
-                        namelist.append(name)
-                    except Exception as e:
-                        exc_type, exc_value, exc_traceback = sys.exc_info()
-                        trace = traceback.format_exception(exc_type, exc_value,
-                                                           exc_traceback)
-                        wid = ErrorAccordion(e, trace)
-                        wids4acc.append(wid)
-                        namelist.append('ERROR at layer {}'.format(name))
-
-                # Features
-                if obj['type'] == 'Feature':
-                    try:
-                        feat = obj['object']
-                        feat_geom = feat.geometry()
-                        if feat_geom.contains(point).getInfo():
-                            info = featurePropertiesOutput(feat)
-                            wid = HTML(info)
-                            # append widget to list of widgets
-                            wids4acc.append(wid)
-                            namelist.append(name)
-                    except Exception as e:
-                        # wid = HTML(str(e).replace('<','{').replace('>','}'))
-                        exc_type, exc_value, exc_traceback = sys.exc_info()
-                        trace = traceback.format_exception(exc_type, exc_value,
-                                                           exc_traceback)
-                        wid = ErrorAccordion(e, trace)
-                        wids4acc.append(wid)
-                        namelist.append('ERROR at layer {}'.format(name))
-
-                # FeatureCollections
-                if obj['type'] == 'FeatureCollection':
-                    try:
-                        fc = obj['object']
-                        filtered = fc.filterBounds(point)
-                        if filtered.size().getInfo() > 0:
-                            feat = ee.Feature(filtered.first())
-                            info = featurePropertiesOutput(feat)
-                            wid = HTML(info)
-                            # append widget to list of widgets
-                            wids4acc.append(wid)
-                            namelist.append(name)
-                    except Exception as e:
-                        wid = HTML(str(e).replace('<','{').replace('>','}'))
-                        wids4acc.append(wid)
-                        namelist.append('ERROR at layer {}'.format(name))
-
-            # Set children and children's name of inspector widget
-            thewidget.children = wids4acc
-            for i, n in enumerate(namelist):
-                thewidget.set_title(i, n)
+        elif ty == 'FeatureCollection':
+            filtered = eeobject.filterBounds(point)
+            if filtered.size().getInfo() > 0:
+                return ee.Feature(filtered.first()).getInfo()
+
+        return None
+
+    @staticmethod
+    def _query_layers(layers, point, scale):
+        """ Get the data of many layers at a point in a single request. See
+        `_query_layer`
+
+        :param layers: pairs of name, EELayer
+        :type layers: dict
+        :return: a dict of name: data
+        :rtype: dict
+        """
+        data = {}
+        for name, obj in layers.items():
+            ty = obj['type']
+            eeobject = obj['object']
+
+            if ty == 'Image':
+                data[name] = Map._image_values(eeobject, point, scale)
+            elif ty == 'ImageCollection':
+                data[name] = tools.imagecollection.getValues(
+                    eeobject, point, scale=scale,
+                    properties=['system:time_start'], side='server')
+            elif ty == 'Feature':
+                data[name] = ee.Algorithms.If(
+                    eeobject.geometry().contains(point), eeobject, None)
+            elif ty == 'FeatureCollection':
+                filtered = eeobject.filterBounds(point)
+                data[name] = ee.Algorithms.If(
+                    filtered.size().gt(0), filtered.first(), None)
+
+        results = ee.Dictionary(data).getInfo()
+
+        for name, obj in layers.items():
+            if obj['type'] == 'Image' and results.get(name) is not None:
+                results[name] = tools.dictionary.sort(results[name])
+
+        return results
+
+    @staticmethod
+    def _layer_widget(ty, data):
+        """ Create the Inspector widget for the data of a layer (see
+        `_query_layer`) """
+        if ty == 'Image':
+            img_html = ''
+            for band, value in data.items():
+                img_html += '<b>{}</b>: {}</br>'.format(band, value)
+            return HTML(img_html)
+
+        elif ty == 'ImageCollection':
+            # header
+            allbands = [val.keys() for bands, val in data.items()]
+            bands = []
+            for bandlist in allbands:
+                for band in bandlist:
+                    if band not in bands:
+                        bands.append(band)
+
+            header = ['image']+bands
+
+            # rows
+            rows = []
+            for imgid, val in data.items():
+                row = ['']*len(header)
+                row[0] = str(imgid)
+                for bandname, bandvalue in val.items():
+                    pos = header.index(bandname) if bandname in header else None
+                    if pos:
+                        row[pos] = str(bandvalue)
+                rows.append(row)
+
+            return HTML(createHTMLTable(header, rows))
+
+        else:
+            return HTML(featurePropertiesHTML(data))
 
     def handle_object_inspector(self, **change):
         """ Handle function for the Object Inspector Widget
@@ -948,7 +1541,7 @@ class Map(ipyleaflet.Map):
             for name, obj in self.EELayers.items(): # for every added layer
                 the_object = obj['object']
                 try:
-                    properties = the_object.getInfo()
+                    properties = cachedInfo(the_object)
                     wid = create_accordion(properties) # Accordion
                     wid.selected_index = None # this will unselect all
                 except Exception as e:
@@ -6,19 +6,41 @@ import ee
 from geetools import tools
 import math
 from uuid import uuid4
+from .cache import LRUCache, make_hash, cached, is_asset_load
 
+# tile URLs retrieved with getMapId indexed by serialized image + vis params
+MAPID_CACHE = LRUCache(maxsize=256, ttl=3600)
 
-def getBounds(eeObject):
+# band names and data types indexed by serialized image
+IMAGE_METADATA_CACHE = LRUCache(maxsize=256)
+
+# bounds of objects indexed by serialized object
+BOUNDS_CACHE = LRUCache(maxsize=256)
+
+
+def getBounds(eeObject, cache=True):
+    """ Get the bounds of an object as a list of [lat, lon] points. Bounds
+    are retrieved in a single request and kept in BOUNDS_CACHE
+
+    :param eeObject: the object to get the bounds from or a list of
+        coordinates
+    :param cache: if True look for the bounds in the cache first
+    :type cache: bool
+    """
     if isinstance(eeObject, list):
         bounds = eeObject
     else:
-        # Make a buffer if object is a Point
-        if isinstance(eeObject, ee.Geometry):
-            t = eeObject.type().getInfo()
-            if t == 'Point':
-                eeObject = eeObject.buffer(1000)
-
-        bounds = tools.geometry.getRegion(eeObject, True)
+        key = make_hash(eeObject.serialize())
+        bounds = BOUNDS_CACHE.get(key) if cache else None
+        if bounds is None:
+            # Make a buffer if object is a Point
+            if isinstance(eeObject, ee.Geometry):
+                eeObject = ee.Geometry(ee.Algorithms.If(
+                    ee.Algorithms.IsEqual(eeObject.type(), 'Point'),
+                    eeObject.buffer(1000), eeObject))
+
+            bounds = tools.geometry.getRegion(eeObject, True)
+            BOUNDS_CACHE.set(key, bounds)
 
     # Catch unbounded images
     unbounded = [[[-180.0, -90.0], [180.0, -90.0],
@@ -33,64 +55,83 @@ def getBounds(eeObject):
     return bounds
 
 
-def getDefaultVis(image, stretch=0.8):
-    bandnames = image.bandNames().getInfo()
+def getBoundsCenter(bounds):
+    """ Get the center of the bounds returned by `getBounds`
 
-    if len(bandnames) < 3:
-        selected = image.select([0]).getInfo()
-        bandnames = bandnames[0]
-    else:
-        selected = image.select([0, 1, 2]).getInfo()
-        bandnames = [bandnames[0], bandnames[1], bandnames[2]]
+    :return: the center as [lat, lon]
+    :rtype: list
+    """
+    points = bounds[0]
+    lats = [point[0] for point in points]
+    lons = [point[1] for point in points]
+    return [(min(lats)+max(lats))/2.0, (min(lons)+max(lons))/2.0]
+
+
+def getImageMetadata(image, cache=True):
+    """ Get the band names and the band data types of an Image in a single
+    request. The result is kept in IMAGE_METADATA_CACHE and, if the image
+    is loaded from an asset ID, in the disk cache if enabled (see
+    `ipygee.cache.enable_disk_cache`)
+
+    :param image: the image to get the metadata from
+    :type image: ee.Image
+    :param cache: if True look for the metadata in the cache first
+    :type cache: bool
+    :return: a dict with keys `bandNames` (list of band names) and
+        `bandTypes` (dict of band name: data type)
+    :rtype: dict
+    """
+    key = make_hash('metadata', image.serialize())
 
-    bands = selected['bands']
-    # bandnames = [bands[0]['id'], bands[1]['id'], bands[2]['id']]
-    types = bands[0]['data_type']
+    def compute():
+        return ee.Dictionary({
+            'bandNames': image.bandNames(),
+            'bandTypes': image.bandTypes()
+        }).getInfo()
 
-    maxs = {'float':1,
-            'double': 1,
-            'int8': 127, 'uint8': 255,
-            'int16': 32767, 'uint16': 65535,
-            'int32': 2147483647, 'uint32': 4294967295,
-            'int64': 9223372036854776000}
+    return cached(key, compute, IMAGE_METADATA_CACHE, refresh=not cache,
+                  persist=is_asset_load(image))
 
-    precision = types['precision']
 
-    if precision == 'float':
-        btype = 'float'
-    elif precision == 'double':
-        btype = 'double'
+def getDataTypeMax(data_type):
+    """ Get the maximum value for a data type as returned by
+    ee.Image.bandTypes. Floating point bands are considered to go up to 1 """
+    precision = data_type.get('precision')
+    if precision in ('float', 'double'):
+        return 1
     elif precision == 'int':
-        max = types['max']
-        maxs_inverse = dict((val, key) for key, val in maxs.items())
-        btype = maxs_inverse[int(max)]
+        return data_type.get('max', 1)
     else:
         raise ValueError('Unknown data type {}'.format(precision))
 
-    limits = {'float': 0.8}
 
-    for key, val in maxs.items():
-        limits[key] = val*stretch
+def getDefaultVis(image, stretch=0.8):
+    metadata = getImageMetadata(image)
+    bandnames = metadata['bandNames']
+
+    if len(bandnames) < 3:
+        bandnames = bandnames[0]
+        first = bandnames
+    else:
+        bandnames = [bandnames[0], bandnames[1], bandnames[2]]
+        first = bandnames[0]
+
+    types = metadata['bandTypes'][first]
 
     min = 0
-    max = limits[btype]
+    max = getDataTypeMax(types)*stretch
     return {'bands':bandnames, 'min':min, 'max':max}
 
 
+_SEQUENCE = (list, tuple)
+_NUMBER = (int, float)
+
+
 def isPoint(item):
     """ Determine if the given list has the structure of a point. This is:
     it is a list or tuple with two int or float items """
-    if isinstance(item, list) or isinstance(item, tuple):
-        if len(item) == 2:
-            lon = item[0]
-            if isinstance(lon, int) or isinstance(lon, float):
-                return True
-            else:
-                return False
-        else:
-            return False
-    else:
-        return False
+    return isinstance(item, _SEQUENCE) and len(item) == 2 and \
+        isinstance(item[0], _NUMBER)
 
 
 def inverseCoordinates(coords):
@@ -99,19 +140,18 @@ def inverseCoordinates(coords):
     :param coords: a nested list of points
     :type coords: list
     """
-    newlist = []
     if isPoint(coords):
         return [coords[1], coords[0]]
-    elif not isinstance(coords, list) and not isinstance(coords, tuple):
+    elif not isinstance(coords, _SEQUENCE):
         raise ValueError('coordinates to inverse must be minimum a point')
-    for i, it in enumerate(coords):
-        p = isPoint(it)
-        if not p and (isinstance(it, list) or isinstance(it, tuple)):
-            newlist.append(inverseCoordinates(it))
-        else:
-            newp = [it[1],it[0]]
-            newlist.append(newp)
-    return newlist
+
+    # the point check is inlined because this runs for every point of
+    # the geometries
+    return [inverseCoordinates(it)
+            if isinstance(it, _SEQUENCE) and not
+            (len(it) == 2 and isinstance(it[0], _NUMBER))
+            else [it[1], it[0]]
+            for it in coords]
 
 
 def visparamsStrToList(params):
@@ -148,15 +188,54 @@ def visparamsListToStr(params):
     return newbands
 
 
+def getTileUrl(image, visParams, cache=True):
+    """ Get the tile URL of an Image with the given visualization parameters
+    (formatted as needed by ee.data.getMapId). Already requested URLs are
+    reused from MAPID_CACHE until they expire
+
+    :param image: the image to get the tile URL from
+    :type image: ee.Image
+    :param visParams: visualization parameters (see `getImageTile`)
+    :type visParams: dict
+    :param cache: if True look for the URL in the cache first
+    :type cache: bool
+    :return: the tile URL
+    :rtype: str
+    """
+    normalized = dict((key, str(val)) for key, val in visParams.items())
+    key = (make_hash(image.serialize()), make_hash(normalized))
+    url = MAPID_CACHE.get(key) if cache else None
+    if url is None:
+        image_info = image.getMapId(visParams)
+        fetcher = image_info['tile_fetcher']
+        url = fetcher.url_format
+        MAPID_CACHE.set(key, url)
+    return url
+
+
+def clearMapIdCache(image=None):
+    """ Remove the cached tile URLs of the given image or all of them if
+    no image is given
+
+    :param image: the image to remove from the cache
+    :type image: ee.Image
+    """
+    if image is None:
+        MAPID_CACHE.clear()
+    else:
+        imhash = make_hash(image.serialize())
+        MAPID_CACHE.invalidate_if(lambda key: key[0] == imhash)
+
+
 def getImageTile(image, visParams, show=True, opacity=None,
-                 overlay=True):
+                 overlay=True, cache=True):
 
     proxy = {}
     params = visParams if visParams else {}
 
     # BANDS #############
     def default_bands(image):
-        bandnames = image.bandNames().getInfo()
+        bandnames = getImageMetadata(image)['bandNames']
         if len(bandnames) < 3:
             bands = [bandnames[0]]
         else:
@@ -191,16 +270,10 @@ def getImageTile(image, visParams, show=True, opacity=None,
     # MAX #################
     def default_max(image, bands):
         proxy_maxs = []
-        maxs = {'float':1,
-                'double': 1,
-                'int8': ((2**8)-1)/2, 'uint8': (2**8)-1,
-                'int16': ((2**16)-1)/2, 'uint16': (2**16)-1,
-                'int32': ((2**32)-1)/2, 'uint32': (2**32)-1,
-                'int64': ((2**64)-1)/2}
+        types = getImageMetadata(image)['bandTypes']
         for band in bands:
-            ty = image.select([band]).getInfo()['bands'][0]['data_type']
             try:
-                themax = maxs[ty]
+                themax = getDataTypeMax(types[band])
             except:
                 themax = 1
             proxy_maxs.append(themax)
@@ -229,9 +302,7 @@ def getImageTile(image, visParams, show=True, opacity=None,
             print("Can't use palette parameter with more than one band")
 
     # Get the MapID and Token after applying parameters
-    image_info = image.getMapId(proxy)
-    fetcher = image_info['tile_fetcher']
-    tiles = fetcher.url_format
+    tiles = getTileUrl(image, proxy, cache)
     attribution = 'Map Data &copy; <a href="https://earthengine.google.com/">Google Earth Engine</a> '
     overlay = overlay
 
@@ -247,6 +318,12 @@ def getImageTile(image, visParams, show=True, opacity=None,
 def featurePropertiesOutput(feat):
     """ generates a string for features properties """
     info = feat.getInfo()
+    return featurePropertiesHTML(info)
+
+
+def featurePropertiesHTML(info):
+    """ generates a string for features properties from the information of
+    the feature (as returned by getInfo) """
     properties = info['properties']
     theid = info.get('id')
     if theid:
@@ -262,18 +339,149 @@ def featurePropertiesOutput(feat):
     return stdout
 
 
-def getGeojsonTile(geometry, name=None,
-                   inspect={'data':None, 'reducer':None, 'scale':None}):
-    ''' Get a GeoJson giving a ee.Geometry or ee.Feature '''
+def countVertices(geojson):
+    """ Count the vertices of a GeoJSON geometry """
+    if geojson['type'] == 'GeometryCollection':
+        return sum(countVertices(geom) for geom in geojson['geometries'])
+
+    def count(coords):
+        if isPoint(coords):
+            return 1
+        return sum(count(c) for c in coords)
+
+    return count(geojson['coordinates'])
+
+
+def douglasPeucker(points, tolerance):
+    """ Simplify a line (list of points) using the Douglas-Peucker algorithm
+
+    :param points: the points of the line
+    :type points: list
+    :param tolerance: maximum distance (in the units of the coordinates)
+        between the original line and the simplified one
+    :type tolerance: float
+    :rtype: list
+    """
+    n = len(points)
+    if n < 3:
+        return list(points)
+
+    keep = [False]*n
+    keep[0] = keep[-1] = True
+    sqtolerance = tolerance*tolerance
+    stack = [(0, n-1)]
+    while stack:
+        first, last = stack.pop()
+        x1, y1 = points[first][0], points[first][1]
+        dx = points[last][0] - x1
+        dy = points[last][1] - y1
+        norm = dx*dx + dy*dy
+        maxdist = 0
+        index = None
+        for i in range(first+1, last):
+            px = points[i][0] - x1
+            py = points[i][1] - y1
+            if norm:
+                t = max(0, min(1, (px*dx + py*dy)/norm))
+                px -= t*dx
+                py -= t*dy
+            dist = px*px + py*py
+            if dist > maxdist:
+                maxdist = dist
+                index = i
+        if index is not None and maxdist > sqtolerance:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+
+    return [point for point, k in zip(points, keep) if k]
+
+
+def simplifyGeojson(geojson, tolerance):
+    """ Simplify a GeoJSON geometry using the Douglas-Peucker algorithm.
+    Rings that would collapse are kept as they are
+
+    :param tolerance: maximum distance in degrees
+    :type tolerance: float
+    :return: a new GeoJSON geometry
+    :rtype: dict
+    """
+    ty = geojson['type']
+
+    def ring(coords):
+        simplified = douglasPeucker(coords, tolerance)
+        return simplified if len(simplified) >= 4 else coords
+
+    def polygon(coords):
+        return [ring(r) for r in coords]
+
+    if ty == 'GeometryCollection':
+        geometries = [simplifyGeojson(geom, tolerance)
+                      for geom in geojson['geometries']]
+        return {'type': ty, 'geometries': geometries}
+
+    coords = geojson['coordinates']
+    if ty == 'LineString':
+        coords = douglasPeucker(coords, tolerance)
+    elif ty == 'MultiLineString':
+        coords = [douglasPeucker(line, tolerance) for line in coords]
+    elif ty in ('Polygon', 'Rectangle'):
+        coords = polygon(coords)
+    elif ty == 'LinearRing':
+        coords = ring(coords)
+    elif ty == 'MultiPolygon':
+        coords = [polygon(poly) for poly in coords]
+
+    return {'type': ty, 'coordinates': coords}
+
+
+def getGeojson(geometry, maxError=None, maxVertices=None):
+    """ Get the GeoJSON of a ee.Geometry or ee.Feature in a single request
+
+    :param maxError: if given, the geometry is simplified in the server with
+        this maximum error (in meters)
+    :type maxError: float
+    :param maxVertices: if given and the geometry has more vertices, it is
+        simplified locally until it fits
+    :type maxVertices: int
+    :return: the GeoJSON geometry and the Feature's information (None for
+        geometries)
+    :rtype: tuple
+    """
+    if maxError:
+        geometry = geometry.simplify(maxError)
 
     if isinstance(geometry, ee.Feature):
-        feat = geometry
-        geometry = feat.geometry()
+        feat_info = geometry.getInfo()
+        geojson = feat_info['geometry']
     else:
-        feat = None
+        feat_info = None
+        geojson = geometry.getInfo()
+
+    if geojson and maxVertices:
+        # meters to degrees
+        tolerance = (maxError or 1) / 111319.49
+        for _ in range(30):
+            if countVertices(geojson) <= maxVertices:
+                break
+            geojson = simplifyGeojson(geojson, tolerance)
+            tolerance *= 2
+
+    return geojson, feat_info
+
+
+def getGeojsonTile(geometry, name=None,
+                   inspect={'data':None, 'reducer':None, 'scale':None},
+                   maxError=None, maxVertices=None):
+    ''' Get a GeoJson giving a ee.Geometry or ee.Feature. See `getGeojson`
+    for `maxError` and `maxVertices` '''
 
-    info = geometry.getInfo()
-    type = info['type']
+    # Geometry and properties are retrieved in a single request
+    geojson, feat_info = getGeojson(geometry, maxError, maxVertices)
+    if isinstance(geometry, ee.Feature):
+        geometry = geometry.geometry()
+
+    type = geojson['type'] if geojson else None
 
     gjson_types = ['Polygon', 'LineString', 'MultiPolygon',
                    'LinearRing', 'MultiLineString', 'MultiPoint',
@@ -284,14 +492,13 @@ def getGeojsonTile(geometry, name=None,
 
     if type in gjson_types:
         data = inspect['data']
-        if feat:
-            default_popup = featurePropertiesOutput(feat)
+        if feat_info:
+            default_popup = featurePropertiesHTML(feat_info)
         else:
             default_popup = type
         red = inspect.get('reducer','first')
         sca = inspect.get('scale', None)
         popval = getData(geometry, data, red, sca, name) if data else default_popup
-        geojson = geometry.getInfo()
 
         return {'geojson':geojson,
                 'pop': popval}
@@ -300,6 +507,50 @@ def getGeojsonTile(geometry, name=None,
         print('unrecognized object type to add to map')
 
 
+def tileKeys(bounds, zoom):
+    """ Get the keys (zoom, x, y) of the map tiles that cover the bounds
+
+    :param bounds: bounds as ((south, west), (north, east)) like the bounds
+        of the Map
+    :type bounds: tuple
+    :param zoom: the zoom level of the tiles
+    :type zoom: int
+    :rtype: list
+    """
+    (south, west), (north, east) = bounds
+    n = 2 ** zoom
+
+    def tile(lat, lon):
+        lat = max(min(lat, 85.0511), -85.0511)
+        lon = max(min(lon, 180.0), -180.0)
+        x = int((lon + 180.0) / 360.0 * n)
+        rad = math.radians(lat)
+        y = int((1.0 - math.log(math.tan(rad) + 1/math.cos(rad)) / math.pi) / 2.0 * n)
+        return min(x, n-1), min(y, n-1)
+
+    xmin, ymin = tile(north, west)
+    xmax, ymax = tile(south, east)
+    return [(zoom, x, y) for x in range(xmin, xmax+1)
+            for y in range(ymin, ymax+1)]
+
+
+def tileBounds(key):
+    """ Get the bounds of a map tile as [west, south, east, north]
+
+    :param key: the key of the tile (zoom, x, y)
+    :type key: tuple
+    """
+    zoom, x, y = key
+    n = 2 ** zoom
+
+    def lat(y):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2.0 * y / n))))
+
+    west = x / float(n) * 360.0 - 180.0
+    east = (x + 1) / float(n) * 360.0 - 180.0
+    return [west, lat(y+1), east, lat(y)]
+
+
 def getZoom(bounds, method=1):
     '''
     as ipyleaflet does not have a fit bounds method, try to get the zoom to fit
@@ -0,0 +1,1094 @@
+# coding=utf-8
+
+""" An offline stand-in for the Earth Engine server.
+
+While a FakeBackend is active the functions of `ee.data` that make requests
+to the server return canned payloads after a configurable latency, so the
+request paths of ipygee can be exercised (and measured with
+`ipygee.profiler.Profiler`) without an account. Start the backend before
+the profiler so the profiler wraps the fake functions.
+
+If Earth Engine has not been initialized, the backend initializes it with
+the list of algorithms shipped with the client library (`ee/tests`), so no
+credentials are needed. Computed objects are evaluated by `Evaluator`, which
+implements the algorithms used by ipygee and geetools and returns a default
+value of the right type for the others.
+"""
+
+import ee
+import os
+import re
+import json
+import copy
+import time
+import threading
+from datetime import datetime, timedelta
+from collections import Counter
+
+TILE_URL = 'https://fake.earthengine/map/{mapid}/{{z}}/{{x}}/{{y}}'
+PROJECT = 'fake-project'
+
+# 2020-01-01T00:00:00Z in milliseconds
+EPOCH = 1577836800000
+DAY = 24 * 3600 * 1000
+
+# band name, precision, min, max
+BANDS = (('B1', 'int', 0, 10000),
+         ('B2', 'int', 0, 10000),
+         ('B3', 'int', 0, 10000),
+         ('QA', 'int', 0, 65535))
+
+WORLD = {'type': 'Polygon',
+         'coordinates': [[[-180, -90], [180, -90], [180, 90], [-180, 90],
+                          [-180, -90]]]}
+
+# Java date patterns (as in ee.Date.format) to strftime
+DATE_PATTERNS = (('yyyy', '%Y'), ('yy', '%y'), ('MM', '%m'), ('dd', '%d'),
+                 ('HH', '%H'), ('mm', '%M'), ('ss', '%S'))
+
+
+class FakeTileFetcher(object):
+    """ Mimic `ee.data.TileFetcher` """
+    def __init__(self, mapid):
+        self.mapid = mapid
+        self.url_format = TILE_URL.format(mapid=mapid)
+
+    def format_tile_url(self, x, y, z):
+        return self.url_format.format(x=x, y=y, z=z)
+
+
+def createTime(i):
+    """ RFC 3339 creation time of the fake operation number `i`. Higher
+    numbers are newer """
+    created = datetime(2020, 1, 1) + timedelta(seconds=i)
+    return created.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def fakeOperation(i, state='SUCCEEDED'):
+    """ Make an operation as returned by ee.data.listOperations """
+    done = state in ('SUCCEEDED', 'FAILED', 'CANCELLED')
+    return {
+        'name': 'projects/{}/operations/FAKE{:06d}'.format(PROJECT, i),
+        'done': done,
+        'metadata': {
+            'state': state,
+            'description': 'fake_task_{}'.format(i),
+            'type': 'EXPORT_IMAGE',
+            'createTime': createTime(i),
+            'updateTime': createTime(i + 600),
+            'startTime': createTime(i + 60),
+        }
+    }
+
+
+def fakeAsset(path, i, asset_type='Image'):
+    """ Make an asset as returned by ee.data.getList """
+    return {'id': '{}/asset_{}'.format(path, i), 'type': asset_type}
+
+
+def loadAlgorithms(path=None):
+    """ Load the algorithms (as returned by ee.data.getAlgorithms) from a
+    JSON file as returned by the ListAlgorithms call of the REST API. If
+    `path` is None use the file shipped with the client library """
+    from ee import _cloud_api_utils
+    if path is None:
+        path = os.path.join(os.path.dirname(ee.__file__), 'tests',
+                            'algorithms.json')
+    with open(path) as f:
+        algorithms = json.load(f)
+    return _cloud_api_utils.convert_algorithms(algorithms)
+
+
+def base_type(ee_type):
+    """ 'Image<unknown bands>' -> 'Image', 'List<Object>' -> 'List' """
+    ee_type = ee_type.split('<', 1)[0]
+    if ee_type in ('Integer', 'Long', 'Float', 'Double'):
+        return 'Number'
+    return ee_type
+
+
+# Algorithms implemented by the Evaluator as name: function. The functions
+# receive the evaluator and the arguments of the call by name
+FUNCTIONS = {}
+
+
+def register(*names):
+    """ Register a function to evaluate the algorithms in `names` """
+    def wrap(func):
+        for name in names:
+            FUNCTIONS[name] = func
+        return func
+    return wrap
+
+
+class Closure(object):
+    """ A function defined in an expression (functionDefinitionValue) """
+    def __init__(self, evaluator, names, body, env):
+        self.evaluator = evaluator
+        self.names = names
+        self.body = body
+        self.env = env
+
+    def __call__(self, *args, **kwargs):
+        env = dict(self.env)
+        env.update(zip(self.names, args))
+        env.update(kwargs)
+        return self.evaluator.reference(self.body, env)
+
+
+class Evaluator(object):
+    """ Evaluate an expression as serialized by
+    `ee.serializer.encode(obj, for_cloud_api=True)`
+
+    :param backend: the FakeBackend that makes the images and collections
+    :type backend: FakeBackend
+    :param expression: the serialized expression
+    :type expression: dict
+    """
+    def __init__(self, backend, expression):
+        self.backend = backend
+        self.values = expression.get('values', {})
+        self.result = expression.get('result')
+        self._memo = {}
+
+    def evaluate(self):
+        return self.reference(self.result, {})
+
+    def reference(self, ref, env):
+        # values that do not depend on function arguments are computed once
+        if env:
+            return self.value(self.values[ref], env)
+        if ref not in self._memo:
+            self._memo[ref] = self.value(self.values[ref], env)
+        return self._memo[ref]
+
+    def value(self, node, env):
+        if 'constantValue' in node:
+            return node['constantValue']
+        if 'integerValue' in node:
+            return int(node['integerValue'])
+        if 'valueReference' in node:
+            return self.reference(node['valueReference'], env)
+        if 'argumentReference' in node:
+            return env.get(node['argumentReference'])
+        if 'arrayValue' in node:
+            return [self.value(v, env)
+                    for v in node['arrayValue'].get('values', [])]
+        if 'dictionaryValue' in node:
+            values = node['dictionaryValue'].get('values', {})
+            return dict((k, self.value(v, env)) for k, v in values.items())
+        if 'functionDefinitionValue' in node:
+            definition = node['functionDefinitionValue']
+            return Closure(self, definition.get('argumentNames', []),
+                           definition['body'], env)
+        if 'functionInvocationValue' in node:
+            return self.invoke(node['functionInvocationValue'], env)
+        return None
+
+    def invoke(self, invocation, env):
+        nodes = invocation.get('arguments', {})
+
+        if 'functionReference' in invocation:
+            closure = self.reference(invocation['functionReference'], env)
+            args = dict((k, self.value(v, env)) for k, v in nodes.items())
+            return closure(**args)
+
+        name = invocation['functionName']
+        # only the branch that is used is evaluated
+        if name == 'If':
+            condition = self.value(nodes['condition'], env)
+            branch = 'trueCase' if condition else 'falseCase'
+            return self.value(nodes[branch], env) if branch in nodes else None
+
+        args = dict((k, self.value(v, env)) for k, v in nodes.items())
+        return self.call(name, args)
+
+    def call(self, name, args):
+        func = self.backend.functions.get(name) or FUNCTIONS.get(name)
+        if func is not None:
+            return func(self, **args)
+        if name.startswith('GeometryConstructors.'):
+            return {'type': name.split('.', 1)[1],
+                    'coordinates': args.get('coordinates')}
+        return self.default(name, args)
+
+    def default(self, name, args):
+        """ Value for the algorithms that are not implemented. If the first
+        argument has the type of the result (like in Image.clip) return it,
+        else return an empty value of the type of the result """
+        self.backend.fallbacks[name] += 1
+        signature = self.backend.algorithms.get(name, {})
+        returns = base_type(signature.get('returns', 'Object'))
+        params = signature.get('args', [])
+        if params:
+            first = params[0]
+            if base_type(first['type']) == returns and \
+                    args.get(first['name']) is not None:
+                return args[first['name']]
+        return self.backend.empty(returns, name)
+
+
+def _element(obj):
+    return obj if isinstance(obj, dict) else {'properties': {}}
+
+
+def _with_properties(obj, properties):
+    obj = dict(_element(obj))
+    obj['properties'] = dict(obj.get('properties', {}), **properties)
+    return obj
+
+
+def _to_string(value):
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return '' if value is None else str(value)
+
+
+def _regex(regex, flags):
+    flags = flags or ''
+    return re.compile(regex, re.IGNORECASE if 'i' in flags else 0)
+
+
+def _date_millis(value):
+    if isinstance(value, dict):
+        return value.get('value', 0)
+    if isinstance(value, str):
+        parsed = datetime.strptime(value[:10], '%Y-%m-%d')
+        return int((parsed - datetime(1970, 1, 1)).total_seconds() * 1000)
+    return value or 0
+
+
+# ELEMENTS ##################################################################
+@register('Image.load')
+def _image_load(ev, id, version=None):
+    return ev.backend.image(id)
+
+
+@register('Image.constant')
+def _image_constant(ev, value):
+    values = value if isinstance(value, list) else [value]
+    names = ['constant'] if len(values) == 1 else \
+        ['constant_{}'.format(i) for i in range(len(values))]
+    return ev.backend.image(None, names)
+
+
+@register('ImageCollection.load')
+def _collection_load(ev, id, version=None):
+    return ev.backend.collection(id)
+
+
+@register('Collection.loadTable')
+def _table_load(ev, tableId, geometryColumn=None, version=None):
+    return ev.backend.table(tableId)
+
+
+@register('Collection', 'ImageCollection.fromImages')
+def _collection(ev, features=None, images=None):
+    elements = features if features is not None else images or []
+    is_image = elements and elements[0].get('type') == 'Image'
+    return {'type': 'ImageCollection' if is_image else 'FeatureCollection',
+            'bands': [], 'properties': {}, 'features': list(elements)}
+
+
+@register('Feature')
+def _feature(ev, geometry=None, metadata=None, geometryKey=None):
+    return {'type': 'Feature', 'geometry': geometry,
+            'properties': dict(metadata or {})}
+
+
+@register('Element.get', 'Image.get', 'Feature.get')
+def _get(ev, object, property):
+    return _element(object).get('properties', {}).get(property)
+
+
+@register('Element.set', 'Image.set', 'Feature.set')
+def _set(ev, object, key, value=None):
+    return _with_properties(object, {key: value})
+
+
+@register('Element.setMulti')
+def _set_multi(ev, object, properties):
+    return _with_properties(object, properties)
+
+
+@register('Element.propertyNames')
+def _property_names(ev, element):
+    return list(_element(element).get('properties', {}).keys())
+
+
+@register('Element.toDictionary')
+def _to_dictionary(ev, element, properties=None):
+    props = _element(element).get('properties', {})
+    if properties is None:
+        return dict((k, v) for k, v in props.items()
+                    if not k.startswith('system:'))
+    return dict((k, props[k]) for k in properties if k in props)
+
+
+@register('Image.id')
+def _image_id(ev, element):
+    return _element(element).get('id')
+
+
+@register('Element.geometry', 'Feature.geometry', 'Image.geometry')
+def _geometry(ev, feature, **kwargs):
+    return _element(feature).get('geometry') or WORLD
+
+
+# IMAGES ####################################################################
+@register('Image.bandNames')
+def _band_names(ev, image):
+    return [band['id'] for band in image.get('bands', [])]
+
+
+@register('Image.bandTypes')
+def _band_types(ev, image):
+    return dict((band['id'], band['data_type'])
+                for band in image.get('bands', []))
+
+
+@register('Image.select')
+def _select(ev, input, bandSelectors, newNames=None):
+    bands = input.get('bands', [])
+    selected = []
+    for selector in bandSelectors:
+        if isinstance(selector, int):
+            selected.append(bands[selector])
+        else:
+            selected += [band for band in bands
+                         if re.match('^{}$'.format(selector), band['id'])]
+    if newNames:
+        selected = [dict(band, id=name)
+                    for band, name in zip(selected, newNames)]
+    return dict(input, bands=selected)
+
+
+@register('Image.rename')
+def _rename(ev, input, names):
+    bands = [dict(band, id=name)
+             for band, name in zip(input.get('bands', []), names)]
+    return dict(input, bands=bands)
+
+
+@register('Image.reduceRegion')
+def _reduce_region(ev, image, reducer=None, **kwargs):
+    return dict((band['id'], ev.backend.pixel(image, band))
+                for band in image.get('bands', []))
+
+
+@register('Image.date')
+def _image_date(ev, image):
+    start = _element(image).get('properties', {}).get('system:time_start')
+    return {'type': 'Date', 'value': start or 0}
+
+
+@register('Image.projection')
+def _projection(ev, image):
+    return {'type': 'Projection', 'crs': 'EPSG:4326',
+            'transform': [1, 0, 0, 0, 1, 0]}
+
+
+@register('Projection.nominalScale')
+def _nominal_scale(ev, proj):
+    return ev.backend.scale
+
+
+@register('ImageCollection.mosaic')
+def _mosaic(ev, collection):
+    images = collection.get('features', [])
+    image = images[0] if images else ev.backend.image(None, [])
+    return dict(image, id=None, properties={})
+
+
+# COLLECTIONS ###############################################################
+@register('Collection.size')
+def _size(ev, collection):
+    return len(collection.get('features', []))
+
+
+@register('Collection.first')
+def _first(ev, collection):
+    features = collection.get('features', [])
+    return features[0] if features else None
+
+
+@register('Collection.limit')
+def _limit(ev, collection, limit=None, key=None, ascending=True):
+    features = collection.get('features', [])
+    if key:
+        features = sorted(
+            features, key=lambda f: f.get('properties', {}).get(key),
+            reverse=not ascending)
+    if limit is not None:
+        features = features[:limit]
+    return dict(collection, features=features)
+
+
+@register('Collection.toList')
+def _collection_to_list(ev, collection, count, offset=0):
+    offset = offset or 0
+    return collection.get('features', [])[offset:offset+count]
+
+
+@register('Collection.iterate')
+def _collection_iterate(ev, collection, function, first=None):
+    result = first
+    for element in collection.get('features', []):
+        result = function(element, result)
+    return result
+
+
+@register('Collection.map')
+def _collection_map(ev, collection, baseAlgorithm, dropNulls=False):
+    features = [baseAlgorithm(f) for f in collection.get('features', [])]
+    if dropNulls:
+        features = [f for f in features if f is not None]
+    return dict(collection, features=features)
+
+
+@register('Collection.filter')
+def _filter(ev, collection, filter):
+    # filters are not evaluated, all the elements pass
+    return collection
+
+
+@register('Collection.geometry')
+def _collection_geometry(ev, collection, maxError=None):
+    return WORLD
+
+
+# GEOMETRIES ################################################################
+@register('Geometry.type')
+def _geometry_type(ev, geometry):
+    return geometry.get('type')
+
+
+@register('Geometry.coordinates')
+def _coordinates(ev, geometry):
+    return geometry.get('coordinates')
+
+
+@register('Geometry.contains', 'Geometry.intersects')
+def _contains(ev, left, right, **kwargs):
+    return True
+
+
+@register('Geometry.bounds')
+def _bounds(ev, geometry, **kwargs):
+    return WORLD
+
+
+# DICTIONARIES ##############################################################
+@register('Dictionary')
+def _dictionary(ev, input=None):
+    if isinstance(input, list):
+        return dict(zip(input[::2], input[1::2]))
+    return dict(input or {})
+
+
+@register('Dictionary.set')
+def _dictionary_set(ev, dictionary, key, value):
+    return dict(dictionary, **{key: value})
+
+
+@register('Dictionary.get')
+def _dictionary_get(ev, dictionary, key, defaultValue=None):
+    return dictionary.get(key, defaultValue)
+
+
+@register('Dictionary.keys')
+def _keys(ev, dictionary):
+    return sorted(dictionary.keys())
+
+
+@register('Dictionary.values')
+def _values(ev, dictionary, keys=None):
+    keys = keys if keys is not None else sorted(dictionary.keys())
+    return [dictionary.get(k) for k in keys]
+
+
+@register('Dictionary.contains')
+def _dictionary_contains(ev, dictionary, key):
+    return key in dictionary
+
+
+@register('Dictionary.size')
+def _dictionary_size(ev, dictionary):
+    return len(dictionary)
+
+
+@register('Dictionary.combine')
+def _combine(ev, first, second, overwrite=True):
+    if overwrite:
+        return dict(first, **second)
+    return dict(second, **first)
+
+
+@register('Dictionary.select')
+def _dictionary_select(ev, dictionary, selectors, ignoreMissing=False):
+    return dict((k, v) for k, v in dictionary.items()
+                if any(re.match('^{}$'.format(s), k) for s in selectors))
+
+
+@register('Dictionary.remove')
+def _dictionary_remove(ev, dictionary, selectors, ignoreMissing=False):
+    return dict((k, v) for k, v in dictionary.items() if k not in selectors)
+
+
+@register('Dictionary.map')
+def _dictionary_map(ev, dictionary, baseAlgorithm):
+    return dict((k, baseAlgorithm(k, v)) for k, v in dictionary.items())
+
+
+@register('Dictionary.fromLists')
+def _from_lists(ev, keys, values):
+    return dict(zip(keys, values))
+
+
+# LISTS #####################################################################
+@register('List.sequence')
+def _sequence(ev, start, end=None, step=None, count=None):
+    step = 1 if step is None else step
+    if count is None:
+        count = int((end - start) // step) + 1
+    return [start + step * i for i in range(int(count))]
+
+
+@register('List.map')
+def _list_map(ev, list, baseAlgorithm, dropNulls=False):
+    result = [baseAlgorithm(element) for element in list]
+    if dropNulls:
+        result = [r for r in result if r is not None]
+    return result
+
+
+@register('List.iterate')
+def _list_iterate(ev, list, function, first):
+    result = first
+    for element in list:
+        result = function(element, result)
+    return result
+
+
+@register('List.get')
+def _list_get(ev, list, index):
+    return list[int(index)]
+
+
+@register('List.size', 'List.length')
+def _list_size(ev, list):
+    return len(list)
+
+
+@register('List.contains')
+def _list_contains(ev, list, element):
+    return element in list
+
+
+@register('List.indexOf')
+def _index_of(ev, list, element):
+    return list.index(element) if element in list else -1
+
+
+@register('List.add')
+def _add(ev, list, element):
+    return list + [element]
+
+
+@register('List.set')
+def _list_set(ev, list, index, element):
+    result = [e for e in list]
+    result[int(index)] = element
+    return result
+
+
+@register('List.cat')
+def _list_cat(ev, list, other):
+    return list + other
+
+
+@register('List.slice')
+def _list_slice(ev, list, start, end=None, step=None):
+    return list[start:end:step]
+
+
+@register('List.zip')
+def _zip(ev, list, other):
+    return [[a, b] for a, b in zip(list, other)]
+
+
+@register('List.flatten')
+def _flatten(ev, list):
+    result = []
+    for element in list:
+        result += _flatten(ev, element) if isinstance(element, type(result)) \
+            else [element]
+    return result
+
+
+@register('List.remove')
+def _remove(ev, list, element):
+    result = [e for e in list]
+    if element in result:
+        result.remove(element)
+    return result
+
+
+@register('List.removeAll')
+def _remove_all(ev, list, other):
+    return [e for e in list if e not in other]
+
+
+@register('List.distinct')
+def _distinct(ev, list):
+    result = []
+    for element in list:
+        if element not in result:
+            result.append(element)
+    return result
+
+
+# STRINGS ###################################################################
+@register('String')
+def _string(ev, input):
+    return _to_string(input)
+
+
+@register('String.cat')
+def _cat(ev, string1, string2):
+    return string1 + string2
+
+
+@register('String.length')
+def _length(ev, string):
+    return len(string)
+
+
+@register('String.slice')
+def _string_slice(ev, string, start, end=None):
+    return string[start:end]
+
+
+@register('String.compareTo')
+def _compare_to(ev, string1, string2):
+    return (string1 > string2) - (string1 < string2)
+
+
+@register('String.match')
+def _match(ev, input, regex, flags=None):
+    pattern = _regex(regex, flags)
+    if 'g' in (flags or ''):
+        return [m.group(0) for m in pattern.finditer(input)]
+    match = pattern.search(input)
+    return [match.group(0)] + list(match.groups()) if match else []
+
+
+@register('String.split')
+def _split(ev, string, regex, flags=None):
+    return _regex(regex, flags).split(string)
+
+
+@register('String.replace')
+def _replace(ev, input, regex, replacement, flags=None):
+    def expand(match):
+        return re.sub(r'\$(\d+)', lambda g: match.group(int(g.group(1))),
+                      replacement)
+    count = 0 if 'g' in (flags or '') else 1
+    return _regex(regex, flags).sub(expand, input, count=count)
+
+
+# NUMBERS ###################################################################
+@register('Number.format')
+def _format(ev, number, pattern=None):
+    if pattern is None:
+        return _to_string(number)
+    return pattern % number
+
+
+OPERATORS = {
+    'Number.eq': lambda a, b: int(a == b),
+    'Number.neq': lambda a, b: int(a != b),
+    'Number.gt': lambda a, b: int(a > b),
+    'Number.gte': lambda a, b: int(a >= b),
+    'Number.lt': lambda a, b: int(a < b),
+    'Number.lte': lambda a, b: int(a <= b),
+    'Number.add': lambda a, b: a + b,
+    'Number.subtract': lambda a, b: a - b,
+    'Number.multiply': lambda a, b: a * b,
+    'Number.divide': lambda a, b: a / b if b else 0,
+    'Number.max': max,
+    'Number.min': min,
+}
+
+
+def _operator(func):
+    def operator(ev, left, right):
+        return func(left, right)
+    return operator
+
+
+for _name, _func in OPERATORS.items():
+    register(_name)(_operator(_func))
+
+
+@register('Number.int', 'Number.toInt', 'Number.long', 'Number.round')
+def _int(ev, input):
+    return int(round(input))
+
+
+@register('IsEqual')
+def _is_equal(ev, left, right):
+    return left == right
+
+
+# DATES #####################################################################
+@register('Date')
+def _date(ev, value, timeZone=None):
+    return {'type': 'Date', 'value': _date_millis(value)}
+
+
+@register('Date.millis')
+def _millis(ev, date):
+    return _date_millis(date)
+
+
+@register('Date.format')
+def _date_format(ev, date, format=None, timeZone=None):
+    moment = datetime(1970, 1, 1) + \
+        timedelta(milliseconds=_date_millis(date))
+    if format is None:
+        return moment.strftime('%Y-%m-%dT%H:%M:%S')
+    for java, python in DATE_PATTERNS:
+        format = format.replace(java, python)
+    return moment.strftime(format)
+
+
+class FakeRequest(object):
+    """ Mimic a request of the Cloud API client (googleapiclient) """
+    def __init__(self, func, **params):
+        self.func = func
+        self.params = params
+
+    def execute(self, num_retries=None):
+        return self.func(**self.params)
+
+
+class FakeOperations(object):
+    """ Mimic `ee.data._get_cloud_projects().operations()` """
+    def __init__(self, backend):
+        self.backend = backend
+
+    def list(self, name=None, pageSize=None, pageToken=None, **kwargs):
+        return FakeRequest(self.backend.listOperationsPage, name=name,
+                           pageSize=pageSize, pageToken=pageToken)
+
+    def list_next(self, previous_request, previous_response):
+        token = previous_response.get('nextPageToken')
+        if not token:
+            return None
+        params = dict(previous_request.params, pageToken=token)
+        return self.list(**params)
+
+
+class FakeProjects(object):
+    """ Mimic `ee.data._get_cloud_projects()` """
+    def __init__(self, backend):
+        self.backend = backend
+
+    def operations(self):
+        return FakeOperations(self.backend)
+
+
+class FakeResource(object):
+    """ Mimic the Cloud API resource of the client library """
+    def __init__(self, backend):
+        self.backend = backend
+
+    def projects(self):
+        return FakeProjects(self.backend)
+
+
+class FakeBackend(object):
+    """ Replace the requests made to Earth Engine with canned payloads
+
+    Usage:
+
+    with FakeBackend(latency=0.2, sizes={'listOperations': 500}) as backend:
+        TaskManager()
+
+    backend.calls  # Counter of calls by name
+
+    :param payloads: a dict of call name: payload. The payload can be a
+        callable which receives the arguments of the call
+    :type payloads: dict
+    :param latency: seconds to wait before returning. It can be a dict of
+        call name: seconds
+    :type latency: float or dict
+    :param sizes: number of items returned by the calls that return lists
+        (listOperations, getList, getAssetRoots) and number of images or
+        features of the collections (collection)
+    :type sizes: dict
+    :param functions: a dict of algorithm name: function to replace the
+        evaluation of an algorithm (see `FUNCTIONS`). The function receives
+        the Evaluator and the arguments of the algorithm by name
+    :type functions: dict
+    :param algorithms: the path to a JSON file with the algorithms to use
+        if Earth Engine is not initialized. Defaults to the file shipped with
+        the client library
+    :type algorithms: str
+    """
+    SIZES = {'listOperations': 50, 'getList': 50, 'getAssetRoots': 1,
+             'collection': 10}
+    STATES = ('SUCCEEDED', 'RUNNING', 'FAILED', 'READY', 'CANCELLED')
+    PAGE_SIZE = 500
+
+    def __init__(self, payloads=None, latency=0, sizes=None, functions=None,
+                 algorithms=None):
+        self.latency = latency
+        self.sizes = dict(self.SIZES)
+        self.sizes.update(sizes or {})
+        self.functions = functions or {}
+        self.algorithms_path = algorithms
+        self.algorithms = {}
+        self.scale = 30
+        self.payloads = {
+            'computeValue': self.computeValue,
+            'getValue': self.computeValue,
+            'getInfo': self.getInfo,
+            'getMapId': self.getMapId,
+            'getList': self.getList,
+            'getAssetRoots': self.getAssetRoots,
+            'listOperations': self.listOperations,
+            'getOperation': self.getOperation,
+            'cancelOperation': lambda *args, **kwargs: None,
+        }
+        self.payloads.update(payloads or {})
+        self.calls = Counter()
+        self.fallbacks = Counter()
+        self._originals = {}
+        self._initialized = False
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def active(self):
+        return bool(self._originals)
+
+    def _wait(self, name):
+        latency = self.latency
+        if isinstance(latency, dict):
+            latency = latency.get(name, 0)
+        if latency:
+            time.sleep(latency)
+
+    def _count(self, name):
+        with self._lock:
+            self.calls[name] += 1
+        self._wait(name)
+
+    def _fake(self, name):
+        def fake(*args, **kwargs):
+            self._count(name)
+            payload = self.payloads[name]
+            if callable(payload):
+                return payload(*args, **kwargs)
+            return payload
+        fake.__name__ = name
+        return fake
+
+    def _replace(self, obj, name, value):
+        if hasattr(obj, name):
+            self._originals[(obj, name)] = getattr(obj, name)
+            setattr(obj, name, value)
+
+    def start(self):
+        """ Replace the functions of ee.data and initialize Earth Engine if
+        needed """
+        if self.active:
+            return
+        for name in self.payloads:
+            self._replace(ee.data, name, self._fake(name))
+
+        # paged listing of operations (Cloud API resource)
+        self._replace(ee.data, '_get_cloud_projects',
+                      lambda: FakeProjects(self))
+        self._replace(ee.data, '_get_cloud_api_resource',
+                      lambda: FakeResource(self))
+        self._replace(ee.data, '_execute_cloud_call',
+                      lambda call, num_retries=None: call.execute())
+
+        if self._is_initialized():
+            self.algorithms = ee.data.getAlgorithms()
+        else:
+            self._initialize()
+
+    def stop(self):
+        """ Restore the functions of ee.data """
+        if self._initialized:
+            ee.Reset()
+            self._initialized = False
+        for (obj, name), func in self._originals.items():
+            setattr(obj, name, func)
+        self._originals = {}
+
+    def reset(self):
+        """ Reset the call counter """
+        with self._lock:
+            self.calls = Counter()
+            self.fallbacks = Counter()
+
+    @staticmethod
+    def _is_initialized():
+        if hasattr(ee.data, 'is_initialized'):
+            return ee.data.is_initialized()
+        return getattr(ee.data, '_initialized', False)
+
+    def _initialize(self):
+        """ Initialize Earth Engine without credentials """
+        self.algorithms = loadAlgorithms(self.algorithms_path)
+        self._replace(ee.data, '_install_cloud_api_resource', lambda: None)
+        self._replace(ee.data, 'getAlgorithms', lambda: self.algorithms)
+        if hasattr(ee, 'deprecation'):
+            self._replace(ee.deprecation, '_FetchDataCatalogStac',
+                          lambda: {})
+        ee.Reset()
+        ee.Initialize(None, '', project=PROJECT)
+        self._initialized = True
+
+    # OBJECTS
+    def image(self, image_id, bands=None, index=0):
+        """ Make the info of an Image (as returned by getInfo) """
+        if bands is None:
+            bands = [(name, {'type': 'PixelType', 'precision': precision,
+                             'min': vmin, 'max': vmax})
+                     for name, precision, vmin, vmax in BANDS]
+        else:
+            bands = [(name, {'type': 'PixelType', 'precision': 'float'})
+                     for name in bands]
+        return {
+            'type': 'Image',
+            'id': image_id,
+            'version': 1,
+            'bands': [{'id': name, 'data_type': data_type,
+                       'crs': 'EPSG:4326',
+                       'crs_transform': [1, 0, 0, 0, 1, 0]}
+                      for name, data_type in bands],
+            'properties': {'system:index': str(index),
+                           'system:time_start': EPOCH + index * DAY},
+        }
+
+    def collection(self, collection_id):
+        """ Make the info of an ImageCollection with `sizes['collection']`
+        images """
+        images = [self.image('{}/{}'.format(collection_id, i), index=i)
+                  for i in range(self.sizes['collection'])]
+        return {'type': 'ImageCollection', 'id': collection_id,
+                'version': 1, 'bands': [], 'properties': {},
+                'features': images}
+
+    def table(self, table_id):
+        """ Make the info of a FeatureCollection with `sizes['collection']`
+        features """
+        features = [{'type': 'Feature', 'id': str(i),
+                     'geometry': {'type': 'Point', 'coordinates': [i, i]},
+                     'properties': {'system:index': str(i), 'value': i}}
+                    for i in range(self.sizes['collection'])]
+        return {'type': 'FeatureCollection', 'id': table_id, 'version': 1,
+                'columns': {'system:index': 'String', 'value': 'Integer'},
+                'properties': {}, 'features': features}
+
+    def pixel(self, image, band):
+        """ Value of a band of an image at any place """
+        index = image.get('properties', {}).get('system:index', '0')
+        try:
+            return int(index) + 1
+        except ValueError:
+            return 1
+
+    def empty(self, ee_type, name=None):
+        """ Default value of an Earth Engine type """
+        if ee_type == 'Number':
+            return 0
+        if ee_type == 'String':
+            return ''
+        if ee_type == 'Boolean':
+            return False
+        if ee_type == 'List':
+            return []
+        if ee_type == 'Dictionary':
+            return {}
+        if ee_type == 'Image':
+            return self.image(None, [])
+        if ee_type in ('ImageCollection', 'FeatureCollection', 'Collection'):
+            return {'type': ee_type, 'bands': [], 'properties': {},
+                    'features': []}
+        if ee_type in ('Feature', 'Element'):
+            return {'type': 'Feature', 'geometry': None, 'properties': {}}
+        if ee_type == 'Geometry':
+            return {'type': 'Point', 'coordinates': [0, 0]}
+        if ee_type in ('Object', 'any'):
+            return None
+        return {'type': ee_type, 'function': name}
+
+    # DEFAULT PAYLOADS
+    def computeValue(self, obj, *args, **kwargs):
+        """ The value of any computed object (see `Evaluator`). Old clients
+        call `getValue` with the serialized object in `json` """
+        if isinstance(obj, dict):
+            expression = obj.get('expression', obj.get('json'))
+            if isinstance(expression, str):
+                expression = json.loads(expression)
+        else:
+            expression = ee.serializer.encode(obj, for_cloud_api=True)
+        result = Evaluator(self, expression).evaluate()
+        return copy.deepcopy(result)
+
+    def getInfo(self, asset_id, *args, **kwargs):
+        return {'id': asset_id, 'type': 'Image'}
+
+    def getMapId(self, params, *args, **kwargs):
+        with self._lock:
+            mapid = 'fake{}'.format(self.calls['getMapId'])
+        return {'mapid': mapid, 'token': '',
+                'tile_fetcher': FakeTileFetcher(mapid)}
+
+    def getList(self, params, *args, **kwargs):
+        path = params.get('id', 'users/fake')
+        return [fakeAsset(path, i) for i in range(self.sizes['getList'])]
+
+    def getAssetRoots(self, *args, **kwargs):
+        return [{'id': 'users/fake{}'.format(i), 'type': 'Folder'}
+                for i in range(self.sizes['getAssetRoots'])]
+
+    def operations(self):
+        """ All the operations, newest first """
+        total = self.sizes['listOperations']
+        return [fakeOperation(i, self.STATES[i % len(self.STATES)])
+                for i in reversed(range(total))]
+
+    def listOperations(self, *args, **kwargs):
+        return self.operations()
+
+    def listOperationsPage(self, name=None, pageSize=None, pageToken=None):
+        """ A page of operations as returned by the Cloud API. Counted as
+        `operations.list` """
+        self._count('operations.list')
+        size = pageSize or self.PAGE_SIZE
+        start = int(pageToken or 0)
+        operations = self.operations()
+        response = {'operations': operations[start:start+size]}
+        if start + size < len(operations):
+            response['nextPageToken'] = str(start + size)
+        return response
+
+    def getOperation(self, name, *args, **kwargs):
+        i = int(name.rsplit('FAKE', 1)[-1] or 0) if 'FAKE' in name else 0
+        return fakeOperation(i)
@@ -3,70 +3,115 @@
 """ Preview widget """
 
 import requests
+import asyncio
 from geetools import tools
 import base64
 from ipywidgets import HTML, Label, Accordion
-import threading
 from time import time
 from . import utils
+from .threading import Worker, CancelToken
 
 CONFIG = {'do_async': True}
 
 
-def image(image, region=None, visualization=None, name=None,
-          dimensions=(500, 500), do_async=None):
-    """ Preview an Earth Engine Image """
-    if do_async is None:
-        do_async = CONFIG.get('do_async')
+def thumbnail(image, region=None, visualization=None, dimensions=(500, 500),
+              token=None):
+    """ Request the thumbnail of an Earth Engine Image
 
-    start = time()
+    :param token: a token to stop between requests
+    :type token: ipygee.threading.CancelToken
+    :return: an HTML widget with the image or a Label with the error
+    """
+    token = token or CancelToken()
+    formatdimension = "x".join([str(d) for d in dimensions])
+    if not region:
+        region = tools.geometry.getRegion(image)
+    else:
+        region = tools.geometry.getRegion(region)
+    params = dict(dimensions=formatdimension, region=region)
+    if visualization:
+        params.update(visualization)
+    token.check()
+    url = image.getThumbURL(params)
+    token.check()
+    req = requests.get(url)
+    token.check()
+    content = req.content
+    rtype = req.headers['Content-type']
+    if rtype in ['image/jpeg', 'image/png']:
+        img64 = base64.b64encode(content).decode('utf-8')
+        src = '<img src="data:image/png;base64,{}"></img>'.format(img64)
+        result = HTML(src)
+    else:
+        result = Label(content.decode('utf-8'))
+
+    return result
 
+
+def _labels(name):
     if name:
         label = '{} (Image)'.format(name)
         loading = 'Loading {} preview...'.format(name)
     else:
         label = 'Image Preview'
         loading = 'Loading preview...'
+    return label, loading
 
-    formatdimension = "x".join([str(d) for d in dimensions])
+
+def image(image, region=None, visualization=None, name=None,
+          dimensions=(500, 500), do_async=None):
+    """ Preview an Earth Engine Image """
+    if do_async is None:
+        do_async = CONFIG.get('do_async')
+
+    start = time()
+
+    label, loading = _labels(name)
 
     wid = Accordion([Label(loading)])
     wid.set_title(0, loading)
 
-    def compute(image, region, visualization):
-        if not region:
-            region = tools.geometry.getRegion(image)
-        else:
-            region = tools.geometry.getRegion(region)
-        params = dict(dimensions=formatdimension, region=region)
-        if visualization:
-            params.update(visualization)
-        url = image.getThumbURL(params)
-        req = requests.get(url)
-        content = req.content
-        rtype = req.headers['Content-type']
-        if rtype in ['image/jpeg', 'image/png']:
-            img64 = base64.b64encode(content).decode('utf-8')
-            src = '<img src="data:image/png;base64,{}"></img>'.format(img64)
-            result = HTML(src)
-        else:
-            result = Label(content.decode('utf-8'))
-
-        return result
-
-    def setAccordion(acc):
-        widget = compute(image, region, visualization)
+    def setAccordion(acc, token):
+        widget = thumbnail(image, region, visualization, dimensions, token)
+        token.check()
         end = time()
         elapsed = end-start
         acc.children = [widget]
         elapsed = utils.format_elapsed(elapsed)
         acc.set_title(0, '{} [{}]'.format(label, elapsed))
 
+    worker = Worker(target=setAccordion, args=(wid,))
+    # the worker can be cancelled with `widget.worker.cancel()`
+    wid.worker = worker
     if do_async:
-        thread = threading.Thread(target=setAccordion, args=(wid,))
-        thread.start()
+        worker.start()
     else:
-        setAccordion(wid)
+        worker.run()
+
+    return wid
+
+
+async def image_async(image, region=None, visualization=None, name=None,
+                      dimensions=(500, 500), executor=None):
+    """ Preview an Earth Engine Image without blocking the event loop. The
+    requests run in `executor` (the default executor of the loop if None)
+    and the returned widget is filled when they finish
+
+    Usage:
+
+    widgets = await asyncio.gather(*[image_async(i) for i in images])
+    """
+    start = time()
+    label, loading = _labels(name)
+    wid = Accordion([Label(loading)])
+    wid.set_title(0, loading)
+
+    loop = asyncio.get_running_loop()
+    widget = await loop.run_in_executor(
+        executor, thumbnail, image, region, visualization, dimensions)
+    wid.children = [widget]
+    elapsed = utils.format_elapsed(time()-start)
+    wid.set_title(0, '{} [{}]'.format(label, elapsed))
 
     return wid
 
@@ -0,0 +1,243 @@
+# coding=utf-8
+
+""" Profile the requests made to Earth Engine.
+
+While a Profiler is active, the functions of `ee.data` that make requests
+to the server are wrapped to record how many times they are called, how
+long they take and the size of their results. Every call is recorded with
+the ipygee function that made it (site) and the current action (see
+`Profiler.action`)
+"""
+
+import ee
+import json
+import sys
+import threading
+from time import time
+from contextlib import contextmanager
+from collections import OrderedDict
+from ipywidgets import VBox, HBox, HTML, Button, ToggleButton
+from .maptools import createHTMLTable
+
+# functions of ee.data that make requests to the server
+CALLS = ('computeValue', 'getValue', 'getInfo', 'getMapId', 'getThumbId',
+         'getList', 'listAssets', 'listImages', 'getAsset', 'getAssetRoots',
+         'listOperations', 'getOperation', 'cancelOperation')
+
+# upper limits (in seconds) of the latency histogram buckets
+BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, float('inf'))
+
+_ACTIVE = []
+_ORIGINALS = {}
+_LOCAL = threading.local()
+_LOCK = threading.Lock()
+
+
+def _payload_size(result):
+    """ Size in bytes of a result once dumped to JSON """
+    try:
+        return len(json.dumps(result, default=str))
+    except Exception:
+        return 0
+
+
+def _call_site():
+    """ Get the innermost ipygee function (outside this module) in the stack
+    of the current thread """
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if module.startswith('ipygee.') and module != __name__:
+            return '{}.{}'.format(module.split('.', 1)[1],
+                                  frame.f_code.co_name)
+        frame = frame.f_back
+    return 'user'
+
+
+def _wrap(name, func):
+    """ Wrap a function of ee.data to record its calls in the active
+    profilers. Calls made from inside another recorded call are not
+    recorded """
+    def wrapper(*args, **kwargs):
+        depth = getattr(_LOCAL, 'depth', 0)
+        if depth:
+            return func(*args, **kwargs)
+
+        site = _call_site()
+        _LOCAL.depth = 1
+        start = time()
+        result = None
+        try:
+            result = func(*args, **kwargs)
+            return result
+        finally:
+            elapsed = time() - start
+            _LOCAL.depth = 0
+            size = _payload_size(result)
+            for profiler in list(_ACTIVE):
+                profiler.record(name, site, elapsed, size)
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def _patch():
+    for name in CALLS:
+        func = getattr(ee.data, name, None)
+        if func is not None:
+            _ORIGINALS[name] = func
+            setattr(ee.data, name, _wrap(name, func))
+
+
+def _unpatch():
+    for name, func in _ORIGINALS.items():
+        setattr(ee.data, name, func)
+    _ORIGINALS.clear()
+
+
+class Profiler(object):
+    """ Record the requests made to Earth Engine
+
+    Usage:
+
+    with Profiler() as profiler:
+        with profiler.action('add image'):
+            Map.addLayer(image)
+
+    profiler.summary()
+    """
+    def __init__(self):
+        self.records = []
+        self.current_action = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def active(self):
+        return self in _ACTIVE
+
+    def start(self):
+        """ Start recording """
+        with _LOCK:
+            if self in _ACTIVE:
+                return
+            if not _ACTIVE:
+                _patch()
+            _ACTIVE.append(self)
+
+    def stop(self):
+        """ Stop recording """
+        with _LOCK:
+            if self not in _ACTIVE:
+                return
+            _ACTIVE.remove(self)
+            if not _ACTIVE:
+                _unpatch()
+
+    def clear(self):
+        """ Remove all records """
+        with self._lock:
+            self.records = []
+
+    @contextmanager
+    def action(self, name):
+        """ Label the calls made inside this context with the name of an
+        action """
+        previous = self.current_action
+        self.current_action = name
+        try:
+            yield self
+        finally:
+            self.current_action = previous
+
+    def record(self, call, site, elapsed, size):
+        """ Record a call """
+        with self._lock:
+            self.records.append({'action': self.current_action,
+                                 'call': call,
+                                 'site': site,
+                                 'elapsed': elapsed,
+                                 'size': size})
+
+    def summary(self, by=('action', 'site', 'call')):
+        """ Summarize the records
+
+        :param by: the fields to group the records by
+        :type by: tuple
+        :return: a dict of group: stats. Stats are count, total and max
+            latency (seconds), bytes and histogram (count of calls for each
+            bucket in BUCKETS)
+        :rtype: OrderedDict
+        """
+        groups = OrderedDict()
+        with self._lock:
+            records = list(self.records)
+        for rec in records:
+            key = tuple(rec[field] for field in by)
+            stats = groups.setdefault(key, {'count': 0, 'total': 0,
+                                            'max': 0, 'bytes': 0,
+                                            'histogram': [0]*len(BUCKETS)})
+            stats['count'] += 1
+            stats['total'] += rec['elapsed']
+            stats['max'] = max(stats['max'], rec['elapsed'])
+            stats['bytes'] += rec['size']
+            for i, limit in enumerate(BUCKETS):
+                if rec['elapsed'] <= limit:
+                    stats['histogram'][i] += 1
+                    break
+        return groups
+
+    def html(self):
+        """ Create an HTML table with the summary of the records """
+        by = ('action', 'site', 'call')
+        buckets = ['<{}s'.format(b) if b != float('inf') else 'more'
+                   for b in BUCKETS]
+        header = list(by) + ['count', 'total (s)', 'max (s)', 'bytes'] + \
+            buckets
+        rows = []
+        for key, stats in self.summary(by).items():
+            row = [k if k is not None else '' for k in key]
+            row += [stats['count'], round(stats['total'], 3),
+                    round(stats['max'], 3), stats['bytes']]
+            row += stats['histogram']
+            rows.append(row)
+        return createHTMLTable(header, rows)
+
+
+class ProfilerWidget(VBox):
+    """ Widget to record and show the requests made to Earth Engine """
+    def __init__(self, profiler=None, **kwargs):
+        super(ProfilerWidget, self).__init__(**kwargs)
+        self.profiler = profiler if profiler else Profiler()
+
+        self.record = ToggleButton(description='Record',
+                                   tooltip='Start/Stop recording requests')
+        self.refresh = Button(description='Refresh')
+        self.clear = Button(description='Clear')
+        self.output = HTML('')
+
+        self.record.observe(self.handle_record, names='value')
+        self.refresh.on_click(self.update)
+        self.clear.on_click(self.handle_clear)
+
+        self.header = HBox([self.record, self.refresh, self.clear])
+        self.children = [self.header, self.output]
+
+    def handle_record(self, change):
+        if change['new']:
+            self.profiler.start()
+        else:
+            self.profiler.stop()
+            self.update()
+
+    def handle_clear(self, button=None):
+        self.profiler.clear()
+        self.update()
+
+    def update(self, button=None):
+        self.output.value = self.profiler.html()
@@ -4,9 +4,10 @@
 
 from ..widgets import RealBox
 from ipywidgets import *
-from ..threading import Thread
+from ..threading import Worker
 from traitlets import *
 from .. import utils
+from ..cache import cachedInfo
 
 
 class FloatBandWidget(HBox):
@@ -41,6 +42,9 @@ class LayersWidget(RealBox):
         # define init EELayer
         self.EELayer = None
 
+        # worker that creates the output of Show Object
+        self._show_worker = None
+
         # Buttons
         self.center = Button(description='Center')
         self.center.on_click(self.onClickCenter)
@@ -80,9 +84,15 @@ class LayersWidget(RealBox):
         if self.EELayer:
             self.map.moveLayer(self.layer.name, 'down')
 
+    def _cancel_show(self):
+        if self._show_worker:
+            self._show_worker.cancel()
+            self._show_worker = None
+
     def handle_selection(self, change):
         new = change['new']
         self.EELayer = new
+        self._cancel_show()
 
         # set original display
         self.items = [[self.selector, self.group1, self.group2]]
@@ -97,11 +107,13 @@ class LayersWidget(RealBox):
         if self.EELayer:
             loading = HTML('Loading <b>{}</b>...'.format(self.layer.name))
             widget = VBox([loading])
-            thread = Thread(target=utils.create_async_output,
+            self._cancel_show()
+            worker = Worker(target=utils.create_async_output,
                             args=(self.obj, widget))
+            self._show_worker = worker
             self.items = [[self.selector, self.group1],
                           [widget]]
-            thread.start()
+            worker.start()
 
     def onClickCenter(self, button=None):
         if self.EELayer:
@@ -124,7 +136,7 @@ class LayersWidget(RealBox):
 
             # Image Bands
             try:
-                info = self.obj.getInfo()
+                info = cachedInfo(self.obj)
             except Exception as e:
                 self.items = [[self.selector, self.group1],
                               [HTML(str(e))]]
@@ -3,17 +3,20 @@
 """ Google Earth Engine Task Manager """
 from .widgets import CheckAccordion, ConfirmationWidget
 from datetime import timedelta, datetime
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dateutil import tz
 from ipygee import utils
 from ipywidgets import *
-from .threading import Thread
-import time
+from .threading import Worker
 import ee
 import re
 
 EPOCH = datetime(1970, 1, 1, 0, 0, tzinfo=tz.tzutc())
 
+# states of the operations that will not change anymore
+TERMINAL_STATES = ('SUCCEEDED', 'FAILED', 'CANCELLED')
+
 TEMPLATES = dict()
 TEMPLATES['PENDING'] = """
 <strong>state:</strong> {state}</br>
@@ -89,6 +92,67 @@ def fromisoformat(iso):
     return datetime(int(year), int(month), int(day), int(hours), int(minutes), sec, microseconds)
 
 
+def createTime(operation):
+    """ Get the creation time of an operation as a datetime (UTC). None if
+    it is unknown """
+    created = operation.get('metadata', {}).get('createTime')
+    try:
+        return fromisoformat(created)
+    except (AttributeError, ValueError):
+        return None
+
+
+def operationsResource():
+    """ Get the operations resource of the Cloud API. Recent versions of the
+    client library expose it with `_get_cloud_projects`, older versions with
+    `_get_cloud_api_resource` """
+    if hasattr(ee.data, '_get_cloud_projects'):
+        return ee.data._get_cloud_projects().operations()
+    return ee.data._get_cloud_api_resource().projects().operations()
+
+
+def listOperationsSince(create_time=None, page_size=100):
+    """ List the operations created after `create_time`. Pages are
+    requested until one has no new operations or, if its operations are
+    sorted newest first, until one has an older operation. If the pages
+    cannot be requested all operations are requested with
+    ee.data.listOperations
+
+    :param create_time: the creation time (see `createTime`) of the newest
+        known operation. If None all operations are listed
+    :type create_time: datetime
+    :param page_size: number of operations for each request
+    :type page_size: int
+    :rtype: list
+    """
+    def is_new(operation):
+        if create_time is None:
+            return True
+        created = createTime(operation)
+        return created is None or created > create_time
+
+    try:
+        resource = operationsResource()
+        request = resource.list(name=ee.data._get_projects_path(),
+                                pageSize=page_size)
+        operations = []
+        while request is not None:
+            response = ee.data._execute_cloud_call(request)
+            page = response.get('operations', [])
+            new = [op for op in page if is_new(op)]
+            operations += new
+            if create_time is not None:
+                created = [createTime(op) for op in page]
+                newest_first = None not in created and all(
+                    a >= b for a, b in zip(created, created[1:]))
+                if not new or (newest_first and len(new) < len(page)):
+                    break
+            request = resource.list_next(request, response)
+        return operations
+    except Exception:
+        return [op for op in ee.data.listOperations() if is_new(op)]
+
+
 class Task(object):
 
     @staticmethod
@@ -359,20 +423,55 @@ class TaskList(CheckAccordion):
         for i in range(self.size()):
             self.update_position(i)
 
+    def html_widget(self, position):
+        """ Get the HTML widget of the task in position """
+        return self.get_widget(position).children[0]
+
+    def patch(self, raw):
+        """ Show a new list of operations reusing the rows of the operations
+        that were already shown. Only the rows of operations that changed or
+        are not finished (their times change) are updated
+
+        :param raw: the operations as returned by ee.data.listOperations
+        :type raw: list
+        """
+        self.raw = raw
+        shown = raw[0:self.limit] if self.limit else raw
+        rows = {task.name: (task, row)
+                for task, row in zip(self.tasks, self.children)}
+        tasklist = list()
+        children = list()
+        for operation in shown:
+            name = operation.get('name')
+            if name in rows:
+                task, row = rows[name]
+                if task.task != operation or not operation.get('done'):
+                    task.task = operation
+                    row.widget.children[0].value = task.html()
+                    row.widget.set_title(0, task.title)
+            else:
+                task = Task(task=operation)
+                row = self.make_row(HTML(task.html()))
+                row.widget.set_title(0, task.title)
+            tasklist.append(task)
+            children.append(row)
+
+        self.tasks = tasklist
+        self.children = tuple(children)
+
     def update_position(self, position):
         task = self.tasks[position]
-        wids = self.widgets
-        title = task.title
-        wids[position].value = '<b>Loading...</b>'
+        wid = self.html_widget(position)
+        wid.value = '<b>Loading...</b>'
         task.update()
         newcontent = task.html()
-        wids[position].value = newcontent
+        wid.value = newcontent
 
     def cancel_position(self, position):
         task = self.tasks[position]
         task.cancel()
-        wids = self.widgets
-        wids[position].value = '<b>Cancelled request sent</b>'
+        wid = self.html_widget(position)
+        wid.value = '<b>Cancelled request sent</b>'
 
     def update_selected(self):
         selected = self.checked_rows()
@@ -452,26 +551,27 @@ class TaskHeader(HBox):
         for checkrow in TL.children:
             checkrow.checkbox.value = value
 
-    def autorefresh_loop(self, slider):
-        while True:
-            time.sleep(slider.value)
+    def autorefresh_loop(self, slider, token):
+        # token.wait returns True as soon as the autorefresh is disabled
+        while not token.wait(slider.value):
             self.tab.refresh()
 
     def autorefresh_handler(self, change):
         value = change['new']
         owner = change['owner']
         if value:
-            p = Thread(target=self.autorefresh_loop, args=(self.slider,))
+            p = Worker(target=self.autorefresh_loop, args=(self.slider,))
             p.start()
             owner.process = p
         else:
-            owner.process.terminate()
-            owner.process.join()
+            owner.process.cancel()
 
 
 class TaskTab(Tab):
     categories = ['PENDING', 'RUNNING', 'SUCCEEDED', 'FAILED', 'CANCELLED']
     TL_index = 0
+    # number of unfinished operations requested at the same time
+    POOL_SIZE = 8
 
     def __init__(self, limit=None, **kwargs):
         super(TaskTab, self).__init__(**kwargs)
@@ -516,6 +616,34 @@ class TaskTab(Tab):
 
     def make_tasklist(self):
         self.tasklist = ee.data.listOperations()
+        # operations indexed by name (newest first)
+        self.operations = OrderedDict((op['name'], op)
+                                      for op in self.tasklist)
+        self.TL = TaskList(self.tasklist, self.limit)
+
+    def update_tasklist(self):
+        """ Update the operations requesting only the ones that are not
+        finished and the ones created since the newest known operation """
+        created = [createTime(op) for op in self.operations.values()]
+        created = [c for c in created if c is not None]
+        newest = max(created) if created else None
+        new = listOperationsSince(newest)
+
+        unfinished = [name for name, op in self.operations.items()
+                      if not op.get('done') and
+                      op.get('metadata', {}).get('state') not in
+                      TERMINAL_STATES]
+        if unfinished:
+            with ThreadPoolExecutor(max_workers=self.POOL_SIZE) as executor:
+                updated = list(executor.map(ee.data.getOperation, unfinished))
+            for operation in updated:
+                self.operations[operation['name']] = operation
+
+        index = OrderedDict((op['name'], op) for op in new)
+        for name, operation in self.operations.items():
+            index.setdefault(name, operation)
+        self.operations = index
+        self.tasklist = list(index.values())
         self.TL = TaskList(self.tasklist, self.limit)
 
     def get_tasklist(self, i=None):
@@ -539,12 +667,17 @@ class TaskTab(Tab):
             self.set_title(i, name)
 
     def refresh(self):
-        i = self.selected_index
-        self.show_loading(i)
-        self.make_tasklist()
+        """ Update the operations (see `update_tasklist`) and patch the
+        rendered categories in place """
+        self.update_tasklist()
         self.complete_titles()
-        self.make(i)
-        self.rendered = [i]
+        for i in self.rendered:
+            category = self.categories[i]
+            TL = self.children[i].children[self.TL_index]
+            if isinstance(TL, TaskList):
+                TL.patch(self.TL.filter(category).raw)
+            else:
+                self.make(i)
 
     def update_selected(self, i=None):
         TL = self.get_tasklist(i)
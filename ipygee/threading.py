@@ -1,7 +1,13 @@
 # coding=utf-8
 
-""" Multithreading hack to add the ability to stop a thread
-from http://tomerfiliba.com/recipes/Thread2/
+""" Threads that can be stopped.
+
+Worker and CancelToken implement cooperative cancellation: the work checks
+the token between Earth Engine requests and its late result is dropped.
+
+Thread is a multithreading hack to add the ability to stop a thread
+from http://tomerfiliba.com/recipes/Thread2/. It cannot interrupt a blocking
+request, use Worker instead.
 """
 
 import threading
@@ -49,3 +55,88 @@ class Thread(threading.Thread):
         """raises SystemExit in the context of the given thread, which should
         cause the thread to exit silently (unless caught)"""
         self.raise_exc(SystemExit)
+
+
+class Cancelled(Exception):
+    """ Raised by CancelToken.check when the token has been cancelled """
+    pass
+
+
+class CancelToken(object):
+    """ A flag shared between a worker and the code that can cancel it """
+    def __init__(self):
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        """ Cancel the token """
+        self._event.set()
+
+    def check(self):
+        """ Raise Cancelled if the token has been cancelled. Call it between
+        requests to stop the work as soon as possible """
+        if self._event.is_set():
+            raise Cancelled()
+
+    def wait(self, timeout=None):
+        """ Sleep for `timeout` seconds or until the token is cancelled
+
+        :return: True if the token has been cancelled
+        :rtype: bool
+        """
+        return self._event.wait(timeout)
+
+
+class Worker(threading.Thread):
+    """ A daemon thread that can be cancelled cooperatively
+
+    :param target: the function to run. It must accept a `token` keyword
+        argument (CancelToken) and call `token.check()` between requests
+    :type target: function
+    :param args: positional arguments for target
+    :type args: tuple
+    :param kwargs: keyword arguments for target
+    :type kwargs: dict
+    :param callback: a function that receives the result of target. It is
+        not called if the worker has been cancelled
+    :type callback: function
+    :param token: a token to share with other workers. If None a new one is
+        created
+    :type token: CancelToken
+    """
+    def __init__(self, target, args=(), kwargs=None, callback=None,
+                 token=None):
+        super(Worker, self).__init__()
+        self.daemon = True
+        self.target = target
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.callback = callback
+        self.token = token or CancelToken()
+
+    @property
+    def cancelled(self):
+        return self.token.cancelled
+
+    def run(self):
+        try:
+            result = self.target(*self.args, token=self.token, **self.kwargs)
+        except Cancelled:
+            return
+        if self.callback and not self.token.cancelled:
+            self.callback(result)
+
+    def cancel(self, wait=False, timeout=None):
+        """ Cancel the worker. Its result will be dropped
+
+        :param wait: wait for the worker to finish
+        :type wait: bool
+        :param timeout: maximum time to wait in seconds
+        :type timeout: float
+        """
+        self.token.cancel()
+        if wait and self.is_alive():
+            self.join(timeout)
@@ -3,7 +3,8 @@
 """ Util functions """
 
 from ipywidgets import *
-from .dispatcher import dispatch
+from . import dispatcher
+from .cache import cachedInfo
 import datetime
 
 
@@ -68,25 +69,29 @@ def create_object_output(object):
     ty = object.__class__.__name__
 
     if ty == 'Image':
-        return dispatch(object).widget
+        return dispatcher.dispatch(object).widget
     elif ty == 'FeatureCollection':
         try:
-            info = object.getInfo()
+            info = cachedInfo(object)
         except:
             print('FeatureCollection limited to 4000 features')
             info = object.limit(4000)
 
         return create_accordion(info)
     else:
-        info = object.getInfo()
+        info = cachedInfo(object)
         return create_accordion(info)
 
 
-def create_async_output(object, widget):
+def create_async_output(object, widget, token=None):
     try:
         child = create_object_output(object)
     except Exception as e:
         child = HTML('There has been an error: {}'.format(str(e)))
 
+    # drop the output if it was cancelled meanwhile
+    if token and token.cancelled:
+        return
+
     widget.children = [child]
 
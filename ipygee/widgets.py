@@ -76,18 +76,19 @@ class CheckAccordion(VBox):
         super(CheckAccordion, self).__init__(**kwargs)
         self.widgets = widgets
 
+    @staticmethod
+    def make_row(widget):
+        """ Make a row (CheckRow with an Accordion) for a widget """
+        # constract the widget
+        acc = Accordion(children=(widget,))
+        acc.selected_index = None # this will unselect all
+        # create a CheckRow
+        return CheckRow(acc)
+
     @observe('widgets')
     def _on_child(self, change):
         new = change['new'] # list of any widget
-        newwidgets = []
-        for widget in new:
-            # constract the widget
-            acc = Accordion(children=(widget,))
-            acc.selected_index = None # this will unselect all
-            # create a CheckRow
-            checkrow = CheckRow(acc)
-            newwidgets.append(checkrow)
-        newchildren = tuple(newwidgets)
+        newchildren = tuple(self.make_row(widget) for widget in new)
         self.children = newchildren
 
     def set_title(self, index, title):
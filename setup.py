@@ -36,7 +36,7 @@ setup(
     extras_require={
     'dev': [],
     'docs': [],
-    'testing': [],
+    'testing': ['pytest', 'pytest-benchmark'],
     },
     classifiers=['Programming Language :: Python :: 2',
                  'Programming Language :: Python :: 2.7',
@@ -0,0 +1,41 @@
+# coding=utf-8
+
+""" Fixtures for the tests. Earth Engine is replaced with
+`ipygee.offline.FakeBackend`, so no credentials are needed """
+
+import pytest
+from ipygee.offline import FakeBackend
+
+
+@pytest.fixture(scope='session')
+def backend():
+    backend = FakeBackend(sizes={'collection': 20, 'listOperations': 200})
+    backend.start()
+    yield backend
+    backend.stop()
+
+
+@pytest.fixture
+def clear_caches():
+    """ Return a function that empties the in-memory caches of ipygee so
+    every call makes its requests """
+    from ipygee import cache, maptools, assets
+
+    def clear():
+        for memory in (cache.INFO_CACHE, maptools.MAPID_CACHE,
+                       maptools.IMAGE_METADATA_CACHE,
+                       maptools.BOUNDS_CACHE, assets.LIST_CACHE):
+            memory.clear()
+    return clear
+
+
+@pytest.fixture
+def calls(backend, clear_caches):
+    """ Return a function that runs `func` with empty caches and returns the
+    calls it made to Earth Engine """
+    def count(func, *args, **kwargs):
+        clear_caches()
+        backend.reset()
+        func(*args, **kwargs)
+        return dict(backend.calls)
+    return count
@@ -0,0 +1,42 @@
+# coding=utf-8
+
+import time
+from geetools import batch
+
+
+def wait_for(condition, timeout=5):
+    end = time.time() + timeout
+    while not condition() and time.time() < end:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_delete_selected_errors(backend, monkeypatch):
+    from ipygee.assets import AssetManager
+
+    deleted = []
+
+    def delete(assetid):
+        if assetid.endswith('bad'):
+            raise Exception('permission denied')
+        deleted.append(assetid)
+
+    monkeypatch.setattr(batch.utils, 'recrusiveDeleteAsset', delete)
+
+    manager = AssetManager()
+    selected = {'users/fake0/bad': 'Image', 'users/fake0/good': 'Image'}
+    monkeypatch.setattr(manager, 'get_selected', lambda: selected)
+    manager.delete_selected()
+
+    backend.reset()
+    confirm = manager.children[1]
+    confirm.yes.click()
+
+    def finished():
+        return 'Could not delete' in manager.children[1].value
+
+    # the error does not stop the other deletions and the list is reloaded
+    assert wait_for(finished)
+    assert deleted == ['users/fake0/good']
+    assert 'users/fake0/bad: permission denied' in manager.children[1].value
+    assert backend.calls['getList'] == 1
@@ -0,0 +1,149 @@
+# coding=utf-8
+
+""" Benchmarks of the request paths of ipygee against the FakeBackend. Each
+benchmark also checks the number of round trips to Earth Engine of the path
+with empty caches.
+
+Run with `pytest tests/test_benchmarks.py`. Use `--benchmark-disable` to
+only check the round trips """
+
+import ee
+import pytest
+
+
+@pytest.fixture
+def image(backend):
+    return ee.Image('FAKE/COLLECTION/0')
+
+
+@pytest.fixture
+def collection(backend):
+    return ee.ImageCollection('FAKE/COLLECTION')
+
+
+@pytest.fixture
+def point(backend):
+    return ee.Geometry.Point([1, 2])
+
+
+@pytest.fixture
+def Map(backend):
+    from ipygee.map import Map
+    return Map()
+
+
+def test_addLayer(benchmark, backend, calls, clear_caches, Map, image):
+    # metadata (bands and types) and map id
+    assert calls(Map.addLayer, image, name='image') == {
+        'computeValue': 1, 'getMapId': 1}
+
+    benchmark.pedantic(Map.addLayer, args=(image,), kwargs={'name': 'image'},
+                       setup=clear_caches, rounds=20)
+
+
+def test_addImageCollection(benchmark, backend, calls, clear_caches, Map,
+                            collection):
+    size = backend.sizes['collection']
+    vis = {'bands': ['B1'], 'min': 0, 'max': 10000}
+
+    # all names in one request and one map id per image
+    assert calls(Map.addImageCollection, collection, vis) == {
+        'computeValue': 1, 'getMapId': size}
+    assert len(Map.EELayers) == size
+
+    benchmark.pedantic(Map.addImageCollection, args=(collection, vis),
+                       setup=clear_caches, rounds=10)
+
+
+def test_handle_inspector(benchmark, backend, calls, clear_caches, Map,
+                          image):
+    Map.INSPECTOR_DEBOUNCE = 0
+    Map.addLayer(image, name='image')
+    Map.addLayer(ee.Image('FAKE/COLLECTION/1'), name='image1')
+    Map.addLayer(ee.FeatureCollection('FAKE/TABLE'), name='table')
+    selector = Map.inspector_wid.selector
+    selector.value = tuple(selector.options.values())
+
+    def click():
+        Map.handlers['Inspector'](type='click', coordinates=[2, 1])
+        Map._inspector_timer.join()
+
+    # every layer in one request
+    assert calls(click) == {'computeValue': 1}
+    titles = [Map.inspector_wid.main.get_title(i)
+              for i in range(len(Map.inspector_wid.main.children))]
+    assert titles[1:] == ['image', 'image1', 'table']
+
+    def setup():
+        clear_caches()
+        Map._inspector_cache.clear()
+
+    benchmark.pedantic(click, setup=setup, rounds=20)
+
+
+def test_dispatch(benchmark, backend, calls, clear_caches, collection):
+    from ipygee import dispatcher
+
+    # info and first page of the collection in one request
+    assert calls(dispatcher.dispatch, collection) == {'computeValue': 1}
+
+    benchmark.pedantic(dispatcher.dispatch, args=(collection,),
+                       setup=clear_caches, rounds=20)
+
+
+def test_TaskTab_refresh(benchmark, backend, calls):
+    from ipygee.tasks import TaskTab, TERMINAL_STATES
+
+    backend.reset()
+    tab = TaskTab()
+    assert backend.calls['listOperations'] == 1
+
+    # the first refresh requests the operations that were not finished,
+    # the next ones do not request them again (they finished)
+    unfinished = [op for op in backend.operations()
+                  if op['metadata']['state'] not in TERMINAL_STATES]
+    assert calls(tab.refresh).get('getOperation') == len(unfinished)
+    assert 'getOperation' not in calls(tab.refresh)
+
+    benchmark(tab.refresh)
+
+
+def test_AssetManager_core(benchmark, backend, calls, clear_caches):
+    from ipygee.assets import AssetManager
+
+    manager = AssetManager()
+    path = manager.root_path
+
+    assert calls(manager.core, path) == {'getList': 1}
+
+    # the list of assets is reused for a while
+    backend.reset()
+    manager.core(path)
+    assert backend.calls['getList'] == 0
+
+    benchmark.pedantic(manager.core, args=(path,), kwargs={'refresh': True},
+                       rounds=20)
+
+
+def test_chart_series(benchmark, backend, calls, clear_caches, collection,
+                      point):
+    from ipygee import chart
+
+    # band names and values of all the images
+    assert calls(chart.Image.series, collection, point, scale=30) == {
+        'computeValue': 2}
+
+    benchmark.pedantic(chart.Image.series, args=(collection, point),
+                       kwargs={'scale': 30}, setup=clear_caches, rounds=10)
+
+
+def test_inverseCoordinates(benchmark):
+    from ipygee.maptools import inverseCoordinates
+
+    # a polygon with a 100k-point ring
+    ring = [[i * 1e-3, -i * 1e-3] for i in range(100000)]
+    polygon = [ring]
+
+    inversed = benchmark(inverseCoordinates, polygon)
+    assert len(inversed[0]) == len(ring)
+    assert inversed[0][1] == [ring[1][1], ring[1][0]]
@@ -0,0 +1,47 @@
+# coding=utf-8
+
+import ee
+import pytest
+from ipygee import cache
+
+
+@pytest.fixture
+def disk(tmpdir):
+    disk = cache.enable_disk_cache(str(tmpdir.join('cache.sqlite')))
+    yield disk
+    cache.disable_disk_cache()
+
+
+def test_is_asset_load(backend):
+    assert cache.is_asset_load(ee.Image('FAKE/COLLECTION/0'))
+    assert not cache.is_asset_load(ee.ImageCollection('FAKE/COLLECTION'))
+    assert not cache.is_asset_load(
+        ee.Image(ee.ImageCollection('FAKE/COLLECTION').first()))
+    assert not cache.is_asset_load(ee.Image(ee.String('FAKE/COLLECTION/0')))
+    assert not cache.is_asset_load(ee.Image('FAKE/COLLECTION/0').add(1))
+
+
+def test_persist_only_asset_metadata(backend, clear_caches, disk):
+    from ipygee.maptools import getImageMetadata
+    from ipygee.assets import AssetManager
+    from ipygee import dispatcher
+
+    image = ee.Image('FAKE/COLLECTION/0')
+    computed = ee.Image(ee.ImageCollection('FAKE/COLLECTION').first())
+    getImageMetadata(image)
+    getImageMetadata(computed)
+    dispatcher.dispatch(image)
+    dispatcher.dispatch(computed)
+    cache.cachedInfo(image.bandNames())
+    AssetManager().core('users/fake0')
+
+    # only the metadata and the information of the image loaded by ID are
+    # on disk
+    assert len(disk) == 2
+
+    # they are not requested again after clearing the memory
+    clear_caches()
+    backend.reset()
+    getImageMetadata(image)
+    dispatcher.dispatch(image)
+    assert backend.calls['computeValue'] == 0
@@ -0,0 +1,50 @@
+# coding=utf-8
+
+""" Importing ipygee must be cheap: `ipygee.eprint` must not import the
+heavy dependencies of the Map and the charts """
+
+import sys
+import json
+import subprocess
+
+# seconds to import ipygee and get eprint
+IMPORT_BUDGET = 3
+
+SCRIPT = """
+import sys, json
+from time import time
+start = time()
+import ipygee
+ipygee.eprint
+elapsed = time() - start
+print(json.dumps({'elapsed': elapsed,
+                  'modules': [m for m in ('ipyleaflet', 'pygal', 'pandas')
+                              if m in sys.modules]}))
+"""
+
+
+def run(script):
+    """ Run a script in a new interpreter (modules are not imported yet)
+    and return what it dumps """
+    output = subprocess.check_output([sys.executable, '-c', script])
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def test_import_eprint():
+    result = run(SCRIPT)
+    assert result['modules'] == []
+    assert result['elapsed'] < IMPORT_BUDGET
+
+
+SUBMODULE_FIRST = """
+import json, types
+from ipygee.eprint import eprint_async
+import ipygee.eprint
+from ipygee import eprint
+print(json.dumps({'function': isinstance(eprint, types.FunctionType)}))
+"""
+
+
+def test_import_eprint_after_submodule():
+    # importing the submodule first must not shadow the function
+    assert run(SUBMODULE_FIRST)['function']
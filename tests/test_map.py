@@ -0,0 +1,40 @@
+# coding=utf-8
+
+import ee
+import asyncio
+import threading
+
+
+def test_addLayer_async_requests_in_executor(backend, calls, monkeypatch):
+    from ipygee.map import Map
+
+    Map = Map()
+    threads = []
+    getMapId = backend.payloads['getMapId']
+
+    def record(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return getMapId(*args, **kwargs)
+
+    monkeypatch.setitem(backend.payloads, 'getMapId', record)
+
+    async def add():
+        images = [ee.Image('FAKE/COLLECTION/{}'.format(i)) for i in range(3)]
+        await asyncio.gather(*[Map.addLayer_async(image)
+                               for image in images])
+
+    # metadata and map id of each image, none of them in the event loop
+    assert calls(asyncio.run, add()) == {'computeValue': 3, 'getMapId': 3}
+    assert threading.main_thread() not in threads
+    assert list(Map.EELayers.keys()) == ['Image 0', 'Image 1', 'Image 2']
+
+
+def test_getDefaultVis_stretch(backend):
+    from ipygee.maptools import getDefaultVis
+
+    image = ee.Image('FAKE/COLLECTION/0')
+    assert getDefaultVis(image, stretch=0.5)['max'] == 5000
+
+    floats = ee.Image.constant([1, 2, 3])
+    assert getDefaultVis(floats)['max'] == 0.8
+    assert getDefaultVis(floats, stretch=0.5)['max'] == 0.5
@@ -0,0 +1,26 @@
+# coding=utf-8
+
+
+def test_refresh_lists_only_new_operations(backend):
+    from ipygee.tasks import TaskTab
+
+    tab = TaskTab()
+    tab.refresh()
+
+    # no new operations: one page and no full listing
+    backend.reset()
+    tab.refresh()
+    assert backend.calls['listOperations'] == 0
+    assert backend.calls['operations.list'] == 1
+
+    # new operations are added first
+    backend.sizes['listOperations'] += 3
+    try:
+        backend.reset()
+        tab.refresh()
+        assert backend.calls['listOperations'] == 0
+        assert backend.calls['operations.list'] == 1
+        names = [op['name'] for op in backend.operations()]
+        assert list(tab.operations.keys()) == names
+    finally:
+        backend.sizes['listOperations'] -= 3